@@ -0,0 +1,262 @@
+"""Vectorized Snake environment: K boards stepped together with NumPy."""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from Board.config import EnvConfig, DEFAULT_CONFIG
+
+
+# Cell codes (identiques a Environment.grid)
+EMPTY = 0
+SNAKE = 1
+GREEN = 2
+RED = 3
+WALL = 4
+
+# Symboles de vision, indexes par les codes renvoyes par get_state()
+SYMBOLS = ("G", "R", "S", "W")
+SYM_GREEN = 0
+SYM_RED = 1
+SYM_SNAKE = 2
+SYM_WALL = 3
+
+# Ordre des actions: UP, RIGHT, DOWN, LEFT (meme ordre que la vision)
+ACTION_DX = np.array([0, 1, 0, -1], dtype=np.int64)
+ACTION_DY = np.array([-1, 0, 1, 0], dtype=np.int64)
+
+# cell code -> symbol code (EMPTY n'est jamais lu)
+_CELL_TO_SYM = np.array([-1, SYM_SNAKE, SYM_GREEN, SYM_RED, SYM_WALL],
+                        dtype=np.int8)
+
+
+class BatchEnvironment:
+    """
+    K parties de Snake stockees en tableaux NumPy et avancees en un seul appel.
+
+    - grid: (K, height, width) int8, memes codes que Environment.grid
+    - body: (K, width*height) int64, ring buffer de cellules (y*width + x),
+      la tete est en body[k, head_ptr[k]]
+    - green_apples / red_apples: (K, n) int64, cellules des pommes
+    - les parties terminees sont reinitialisees automatiquement dans move()
+
+    Les rewards et les regles de fin de partie sont celles de
+    Environment.move(direction, state, action).
+    """
+
+    def __init__(self, num_envs: int, config: EnvConfig = DEFAULT_CONFIG,
+                 seed: Optional[int] = None):
+        self.num_envs = num_envs
+        self.config = config
+        self.width = config.width
+        self.height = config.height
+        self.num_cells = config.width * config.height
+        self.max_steps_without_food = config.max_steps_without_food
+        self.rewards = config.rewards
+        self.rng = np.random.default_rng(seed)
+
+        self.grid = np.zeros((num_envs, self.height, self.width), dtype=np.int8)
+        self.body = np.zeros((num_envs, self.num_cells), dtype=np.int64)
+        self.head_ptr = np.zeros(num_envs, dtype=np.int64)
+        self.length = np.zeros(num_envs, dtype=np.int64)
+        self.green_apples = np.zeros((num_envs, config.green_apples), dtype=np.int64)
+        self.red_apples = np.zeros((num_envs, config.red_apples), dtype=np.int64)
+        self.steps_without_food = np.zeros(num_envs, dtype=np.int64)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+
+        # Rempli pour les parties terminees au dernier move()
+        self.final_lengths = np.zeros(num_envs, dtype=np.int64)
+        self.final_steps = np.zeros(num_envs, dtype=np.int64)
+
+        self._symbols = np.zeros((num_envs, 4), dtype=np.int8)
+        self._buckets = np.zeros((num_envs, 4), dtype=np.int8)
+
+        self._ray_offsets = np.arange(1, max(self.width, self.height) + 1,
+                                      dtype=np.int64)
+
+        self.reset(np.ones(num_envs, dtype=bool))
+
+    ###########################################
+    ########## RESET / SPAWN ##################
+    ###########################################
+
+    def _spawn(self, boards: np.ndarray) -> np.ndarray:
+        """Choisit une cellule vide uniforme pour chaque board de `boards`.
+        Leve ValueError si un board n'a plus de case vide, comme
+        Environment.random_empty_cell."""
+        flat = self.grid.reshape(self.num_envs, -1)[boards]
+        occupied = flat != EMPTY
+        full = occupied.all(axis=1)
+        if full.any():
+            raise ValueError(f"Plus de case vide sur les boards {boards[full].tolist()}")
+        keys = self.rng.random(flat.shape)
+        keys[occupied] = -1.0
+        return keys.argmax(axis=1)
+
+    def reset(self, mask: np.ndarray) -> None:
+        """Reinitialise les boards selectionnes par `mask`."""
+        boards = np.flatnonzero(mask)
+        if boards.size == 0:
+            return
+        w = self.width
+        flat = self.grid.reshape(self.num_envs, -1)
+
+        flat[boards] = EMPTY
+        x = self.rng.integers(2, w, size=boards.size)
+        y = self.rng.integers(0, self.height, size=boards.size)
+        head = y * w + x
+
+        self.head_ptr[boards] = 0
+        self.length[boards] = 3
+        for i in range(3):
+            self.body[boards, i] = head - i
+            flat[boards, head - i] = SNAKE
+
+        for i in range(self.green_apples.shape[1]):
+            cell = self._spawn(boards)
+            self.green_apples[boards, i] = cell
+            flat[boards, cell] = GREEN
+        for i in range(self.red_apples.shape[1]):
+            cell = self._spawn(boards)
+            self.red_apples[boards, i] = cell
+            flat[boards, cell] = RED
+
+        self.steps_without_food[boards] = 0
+        self.steps[boards] = 0
+        self._compute_state(boards)
+
+    ###########################################
+    ########## VISION #########################
+    ###########################################
+
+    def _compute_state(self, boards: np.ndarray) -> None:
+        """Lance les 4 rayons depuis la tete pour les boards donnes."""
+        w, h = self.width, self.height
+        flat = self.grid.reshape(self.num_envs, -1)[boards]
+        head = self.body[boards, self.head_ptr[boards]]
+        hx = (head % w)[:, None]
+        hy = (head // w)[:, None]
+        rows = np.arange(boards.size)[:, None]
+
+        for a in range(4):
+            xs = hx + ACTION_DX[a] * self._ray_offsets
+            ys = hy + ACTION_DY[a] * self._ray_offsets
+            inside = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+            cells = np.where(inside, ys * w + xs, 0)
+            values = np.where(inside, flat[rows, cells], WALL)
+            first = (values != EMPTY).argmax(axis=1)
+            hit = values[rows[:, 0], first]
+            dist = first + 1
+            self._symbols[boards, a] = _CELL_TO_SYM[hit]
+            self._buckets[boards, a] = np.where(dist <= 2, 1,
+                                                np.where(dist <= 4, 2, 3))
+
+    def get_state(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vision de chaque board.
+        Retourne (symbols, buckets), deux tableaux (K, 4) int8.
+        symbols indexe SYMBOLS, buckets vaut 1, 2 ou 3.
+        Ordre: UP, RIGHT, DOWN, LEFT
+        """
+        return self._symbols.copy(), self._buckets.copy()
+
+    def state_tuple(self, k: int) -> Tuple:
+        """Etat du board k au format de Environment.get_state()."""
+        return tuple(
+            (SYMBOLS[s], int(b))
+            for s, b in zip(self._symbols[k], self._buckets[k])
+        )
+
+    ###########################################
+    ########## GAME LOGIC #####################
+    ###########################################
+
+    def _pop_tail(self, boards: np.ndarray) -> None:
+        tail_ptr = (self.head_ptr[boards] + self.length[boards] - 1) % self.num_cells
+        tail = self.body[boards, tail_ptr]
+        self.grid.reshape(self.num_envs, -1)[boards, tail] = EMPTY
+        self.length[boards] -= 1
+
+    def move(self, actions) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        actions: (K,) int 0..3 correspondant a (UP, RIGHT, DOWN, LEFT)
+        Le shaping vision-only utilise l'etat courant (avant le move).
+        Retourne: (rewards, dones). Les boards termines sont reinitialises;
+        final_lengths / final_steps donnent leur resultat.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        n, w = self.num_envs, self.width
+        idx = np.arange(n)
+        flat = self.grid.reshape(n, -1)
+
+        head = self.body[idx, self.head_ptr]
+        nx = head % w + ACTION_DX[actions]
+        ny = head // w + ACTION_DY[actions]
+        out = (nx < 0) | (nx >= w) | (ny < 0) | (ny >= self.height)
+        new_head = np.where(out, 0, ny * w + nx)
+        content = np.where(out, WALL, flat[idx, new_head])
+
+        # --- collisions (game over), la queue compte comme obstacle ---
+        dead = out | (content == SNAKE)
+        alive = ~dead
+        green = alive & (content == GREEN)
+        red = alive & (content == RED)
+        normal = alive & (content == EMPTY)
+
+        # --- avancer la tete ---
+        a = idx[alive]
+        self.head_ptr[a] = (self.head_ptr[a] - 1) % self.num_cells
+        self.body[a, self.head_ptr[a]] = new_head[a]
+        flat[a, new_head[a]] = SNAKE
+        self.length[a] += 1
+        # le move fatal compte, comme dans play_evaluation_game
+        self.steps += 1
+
+        # --- respawn des pommes mangees (queue encore en place) ---
+        g = idx[green]
+        if g.size:
+            slot = (self.green_apples[g] == new_head[g][:, None]).argmax(axis=1)
+            cell = self._spawn(g)
+            self.green_apples[g, slot] = cell
+            flat[g, cell] = GREEN
+        r = idx[red]
+        if r.size:
+            slot = (self.red_apples[r] == new_head[r][:, None]).argmax(axis=1)
+            cell = self._spawn(r)
+            self.red_apples[r, slot] = cell
+            flat[r, cell] = RED
+
+        # --- queue: -1 en move normal, -2 pour une pomme rouge ---
+        self._pop_tail(idx[normal | red])
+        self._pop_tail(idx[red])
+
+        self.steps_without_food[green | red] = 0
+        self.steps_without_food[normal] += 1
+
+        # --- rewards ---
+        table = self.rewards
+        sym = self._symbols[idx, actions]
+        bucket = self._buckets[idx, actions]
+        danger = ((sym == SYM_WALL) | (sym == SYM_SNAKE)) & (bucket == 1)
+        shaped = table.step + np.where(danger, table.danger, 0.0)
+        shaped = shaped + np.where(sym == SYM_GREEN, table.see_green, 0.0)
+        shaped = shaped + np.where(sym == SYM_RED, table.see_red, 0.0)
+
+        starved = normal & (self.steps_without_food > self.max_steps_without_food)
+        red_dead = red & (self.length == 0)
+
+        rewards = np.where(normal, shaped, 0.0)
+        rewards[green] = table.green
+        rewards[red] = table.red
+        rewards[dead | red_dead] = table.death
+        rewards[starved] = table.timeout
+
+        dones = dead | red_dead | starved
+        self.final_lengths[dones] = self.length[dones]
+        self.final_steps[dones] = self.steps[dones]
+
+        live = idx[~dones]
+        if live.size:
+            self._compute_state(live)
+        self.reset(dones)
+        return rewards, dones
@@ -0,0 +1,48 @@
+"""Board configuration: dimensions, apple counts, starvation limit and rewards."""
+
+from dataclasses import dataclass, field, fields, replace
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class RewardTable:
+    """Rewards renvoyes par Environment.move."""
+    death: float = -100.0       # mur, collision, longueur 0
+    green: float = 20.0         # pomme verte mangee
+    red: float = -20.0          # pomme rouge mangee
+    timeout: float = -50.0      # trop de steps sans manger
+    step: float = -0.01         # malus par step
+    danger: float = -1.0        # shaping: mur/corps visible a distance 1
+    see_green: float = 0.2      # shaping: pomme verte visible
+    see_red: float = -0.2       # shaping: pomme rouge visible
+
+    def override(self, values: Dict[str, float]) -> "RewardTable":
+        """Copie avec certains rewards remplaces (cles = noms des champs)."""
+        unknown = sorted(set(values) - {f.name for f in fields(self)})
+        if unknown:
+            raise ValueError(f"Reward inconnu: {', '.join(unknown)}")
+        return replace(self, **{name: float(v) for name, v in values.items()})
+
+
+@dataclass(frozen=True)
+class EnvConfig:
+    """Parametres du plateau partages par l'environnement, les modes et la CLI."""
+    width: int = 10
+    height: int = 10
+    green_apples: int = 2
+    red_apples: int = 1
+    max_steps_without_food: int = 100
+    rewards: RewardTable = field(default_factory=RewardTable)
+
+    def __post_init__(self):
+        if self.width < 3 or self.height < 1:
+            raise ValueError(
+                f"Plateau trop petit: {self.width}x{self.height} (min 3x1)"
+            )
+        if self.green_apples < 0 or self.red_apples < 0:
+            raise ValueError("Le nombre de pommes doit etre positif")
+        if 3 + self.green_apples + self.red_apples > self.width * self.height:
+            raise ValueError("Trop de pommes pour la taille du plateau")
+
+
+DEFAULT_CONFIG = EnvConfig()
@@ -1,9 +1,9 @@
 import random
 import math
+from collections import deque
 
+from Board.config import EnvConfig, DEFAULT_CONFIG
 
-WIDTH = 10
-HEIGHT = 10
 
 UP = (0, -1)
 DOWN = (0, 1)
@@ -12,6 +12,85 @@ RIGHT = (1, 0)
 
 ACTIONS = [UP, DOWN, LEFT, RIGHT]
 
+# Directions des actions entieres de step() (meme ordre que la vision)
+STEP_DIRECTIONS = (UP, RIGHT, DOWN, LEFT)
+
+# Cell codes (grid / occupancy)
+EMPTY = 0
+SNAKE = 1
+GREEN = 2
+RED = 3
+
+WALL = 4
+
+_CELL_SYMBOLS = ("0", "S", "G", "R", "W")
+
+
+def _bucket(d: int) -> int:
+    return 1 if d <= 2 else (2 if d <= 4 else 3)
+
+
+_RAY_TABLES = {}
+
+
+def _ray_table(max_distance: int):
+    """
+    table[content][distance] -> (symbol, bucket), tuples partages entre
+    environnements pour ne rien allouer pendant la vision.
+    """
+    table = _RAY_TABLES.get(max_distance)
+    if table is None:
+        table = [
+            [(sym, _bucket(d)) for d in range(max_distance + 1)]
+            for sym in _CELL_SYMBOLS
+        ]
+        _RAY_TABLES[max_distance] = table
+    return table
+
+
+def _scan(cells, i, step, limit, rays):
+    """Premier objet d'un rayon partant de la case i (pas `step`, `limit`
+    cases avant le mur): rays[contenu][distance], ou le mur."""
+    for distance in range(1, limit + 1):
+        i += step
+        content = cells[i]
+        if content:
+            return rays[content][distance]
+    return rays[WALL][limit + 1]
+
+
+class _GeneratorRng:
+    """Adapte un numpy.random.Generator a l'interface randint / randrange."""
+
+    def __init__(self, generator):
+        self.generator = generator
+
+    def randint(self, a, b):
+        return int(self.generator.integers(a, b + 1))
+
+    def randrange(self, n):
+        return int(self.generator.integers(n))
+
+
+def make_rng(rng=None):
+    """
+    Source d'aleatoire d'un environnement: random.Random tel quel, une seed
+    entiere, un numpy Generator, ou None pour un generateur propre non seede.
+    Jamais le module random global: deux environnements ne partagent pas
+    d'etat sauf si on leur passe explicitement le meme generateur.
+    """
+    if rng is None or isinstance(rng, int):
+        return random.Random(rng)
+    if hasattr(rng, "integers"):
+        return _GeneratorRng(rng)
+    return rng
+
+
+def make_rngs(seed: int):
+    """Generateurs independants (environnement, agent) derives d'une seed:
+    les tirages de l'agent ne decalent jamais les pommes, et inversement."""
+    return random.Random(2 * seed), random.Random(2 * seed + 1)
+
 
 class Environment:
     UP = UP
@@ -19,24 +98,49 @@ class Environment:
     LEFT = LEFT
     RIGHT = RIGHT
 
-    def __init__(self):
-        self.grid = [[0 for _ in range(WIDTH)] for _ in range(HEIGHT)]
-
-        x = random.randint(2, WIDTH - 1)
-        y = random.randint(0, HEIGHT - 1)
-        self.snake = [(x, y), (x - 1, y), (x - 2, y)]
+    def __init__(self, config: EnvConfig = DEFAULT_CONFIG, rng=None,
+                 headless: bool = False):
+        self.config = config
+        # headless: pas de grille 2D (seulement utile a l'affichage pygame),
+        # update_grid() la reconstruit a la demande
+        self.headless = headless
+        # Copie locale de la config (pas de lookup global dans le hot path)
+        self.width = config.width
+        self.height = config.height
+        self.max_steps_without_food = config.max_steps_without_food
+        self.rewards = config.rewards
+        self._rays = _ray_table(max(self.width, self.height) + 1)
+
+        # Source d'aleatoire propre a l'environnement (voir make_rng)
+        self.rng = make_rng(rng)
+
+        self._reset_cells()
+
+        x = self.rng.randint(2, self.width - 1)
+        y = self.rng.randint(0, self.height - 1)
+        self.snake = deque([(x, y), (x - 1, y), (x - 2, y)])
+        for pos in self.snake:
+            self._set_cell(pos, SNAKE)
         self.game_over = False
 
         self.green_apples = []
-        self.red_apple = None
+        self.red_apples = []
 
-        self.green_apples = [self.random_empty_cell() for _ in range(2)]
-        self.red_apple = self.random_empty_cell()
+        for _ in range(config.green_apples):
+            apple = self.random_empty_cell()
+            self.green_apples.append(apple)
+            self._set_cell(apple, GREEN)
+        for _ in range(config.red_apples):
+            apple = self.random_empty_cell()
+            self.red_apples.append(apple)
+            self._set_cell(apple, RED)
 
         self.steps_without_food = 0
-        self.max_steps_without_food = 100
 
-        self.update_grid()
+    @property
+    def red_apple(self):
+        """Premiere pomme rouge (compatibilite avec l'ancien format)."""
+        return self.red_apples[0] if self.red_apples else None
 
     ###########################################
     ########## DISTANCE HELPERS ###############
@@ -54,10 +158,13 @@ class Environment:
         return min_dist
 
     def distance_to_red_apple(self, pos):
-        """Calcule la distance Manhattan vers la pomme rouge."""
-        if not self.red_apple:
+        """Calcule la distance Manhattan vers la pomme rouge la plus proche."""
+        if not self.red_apples:
             return float('inf')
-        return abs(pos[0] - self.red_apple[0]) + abs(pos[1] - self.red_apple[1])
+        return min(
+            abs(pos[0] - apple[0]) + abs(pos[1] - apple[1])
+            for apple in self.red_apples
+        )
 
     def display_grid(self):
         self.update_grid()
@@ -68,32 +175,73 @@ class Environment:
     ########## GAME LOGIC #####################
     ###########################################
     
+    def _reset_cells(self):
+        """Plateau vide: occupation, grille et index des cases libres."""
+        w, h = self.width, self.height
+        self.grid = None if self.headless else [[EMPTY for _ in range(w)] for _ in range(h)]
+        # Occupation a plat (index y * width + x), patchee case par case
+        self.cells = bytearray(w * h)
+        # Index des cases libres: tableau a retrait par swap + case -> slot
+        self.free_cells = list(range(w * h))
+        self.free_slot = list(range(w * h))
+        # Nb de cases occupees par ligne / colonne (rayons vides en O(1))
+        self.row_objects = [0] * h
+        self.col_objects = [0] * w
+        # Vision en cache, invalidee a chaque modification de case
+        self._state = None
+
+    def _set_cell(self, pos, value):
+        """Met a jour une seule case de l'occupation, de la grille et de
+        l'index des cases libres."""
+        x, y = pos
+        i = y * self.width + x
+        old = self.cells[i]
+        self.cells[i] = value
+        grid = self.grid
+        if grid is not None:
+            grid[y][x] = value
+        self._state = None
+
+        if old == EMPTY and value != EMPTY:
+            self.row_objects[y] += 1
+            self.col_objects[x] += 1
+            # retrait O(1): la derniere case libre prend la place de i
+            free, slot = self.free_cells, self.free_slot
+            j = slot[i]
+            last = free.pop()
+            if last != i:
+                free[j] = last
+                slot[last] = j
+            slot[i] = -1
+        elif old != EMPTY and value == EMPTY:
+            self.row_objects[y] -= 1
+            self.col_objects[x] -= 1
+            self.free_slot[i] = len(self.free_cells)
+            self.free_cells.append(i)
+
     def random_empty_cell(self):
-        empty = [
-            (x, y)
-            for y in range(HEIGHT)
-            for x in range(WIDTH)
-            if (x, y) not in self.snake
-            and (x, y) not in self.green_apples
-            and (x, y) != self.red_apple
-        ]
-        return random.choice(empty)
+        """Case vide tiree uniformement, en O(1) via l'index des cases libres."""
+        free = self.free_cells
+        i = free[self.rng.randrange(len(free))]
+        w = self.width
+        return (i % w, i // w)
 
     def GameOver(self):
         self.game_over = True
         
     def update_grid(self):
-        self.grid = [[0 for _ in range(WIDTH)] for _ in range(HEIGHT)]
-        for x, y in self.snake:
-            if 0 <= x < WIDTH and 0 <= y < HEIGHT:
-                self.grid[y][x] = 1
-        for x, y in self.green_apples:
-            if 0 <= x < WIDTH and 0 <= y < HEIGHT:
-                self.grid[y][x] = 2
-        if self.red_apple:
-            x, y = self.red_apple
-            if 0 <= x < WIDTH and 0 <= y < HEIGHT:
-                self.grid[y][x] = 3
+        """Reconstruit l'occupation et la grille depuis snake / pommes.
+        move() les tient deja a jour case par case: utile seulement apres
+        une modification manuelle de snake ou des pommes, ou pour obtenir
+        la grille d'un environnement headless (qui cesse de l'etre)."""
+        self.headless = False
+        self._reset_cells()
+        for pos in self.snake:
+            self._set_cell(pos, SNAKE)
+        for pos in self.green_apples:
+            self._set_cell(pos, GREEN)
+        for pos in self.red_apples:
+            self._set_cell(pos, RED)
 
     def move(self, direction, state=None, action=None):
         """
@@ -103,54 +251,63 @@ class Environment:
         Retourne: (reward, done)
         """
         reward = 0.0
+        rewards = self.rewards
 
         head_x, head_y = self.snake[0]
         dir_x, dir_y = direction
         new_head = (head_x + dir_x, head_y + dir_y)
 
         # --- collisions (game over) ---
-        if not (0 <= new_head[0] < WIDTH and 0 <= new_head[1] < HEIGHT):
+        w = self.width
+        if not (0 <= new_head[0] < w and 0 <= new_head[1] < self.height):
             self.game_over = True
-            return -100.0, True
+            return rewards.death, True
 
-        if new_head in self.snake:
+        content = self.cells[new_head[1] * w + new_head[0]]
+        if content == SNAKE:
             self.game_over = True
-            return -100.0, True
+            return rewards.death, True
 
         # --- manger green ---
-        if new_head in self.green_apples:
+        if content == GREEN:
             self.green_apples.remove(new_head)
-            self.green_apples.append(self.random_empty_cell())
-            self.snake.insert(0, new_head)  # grow
+            self.snake.appendleft(new_head)  # grow
+            self._set_cell(new_head, SNAKE)
+            apple = self.random_empty_cell()
+            self.green_apples.append(apple)
+            self._set_cell(apple, GREEN)
             self.steps_without_food = 0
-            self.update_grid()
-            return 20.0, False
+            return rewards.green, False
 
         # --- manger red ---
-        if new_head == self.red_apple:
-            self.red_apple = self.random_empty_cell()
-            self.snake.insert(0, new_head)
+        if content == RED:
+            self.red_apples.remove(new_head)
+            apple = self.random_empty_cell()
+            self.red_apples.append(apple)
+            self.snake.appendleft(new_head)
+            self._set_cell(new_head, SNAKE)
 
             # raccourcir de 1 (au total) : on retire 2 segments car on a "insert"
-            self.snake.pop()
+            self._set_cell(self.snake.pop(), EMPTY)
             if len(self.snake) > 0:
-                self.snake.pop()
+                self._set_cell(self.snake.pop(), EMPTY)
+            self._set_cell(apple, RED)
 
             if len(self.snake) == 0:
                 self.game_over = True
-                return -100.0, True
+                return rewards.death, True
 
             self.steps_without_food = 0
-            self.update_grid()
-            return -20.0, False
+            return rewards.red, False
 
         # --- move normal ---
-        self.snake.insert(0, new_head)
-        self.snake.pop()
+        self.snake.appendleft(new_head)
+        self._set_cell(new_head, SNAKE)
+        self._set_cell(self.snake.pop(), EMPTY)
         self.steps_without_food += 1
 
         # petit malus par step (pour éviter tourner en rond)
-        reward -= 0.01
+        reward += rewards.step
 
         # --- shaping "vision-only" (optionnel mais utile) ---
         # Utilise UNIQUEMENT state[action] = ('G',dist) / ('W',1) etc.
@@ -161,37 +318,48 @@ class Environment:
 
                 # danger immédiat
                 if sym in ("W", "S") and dist == 1:
-                    reward -= 1.0
+                    reward += rewards.danger
 
                 # aller dans une direction où une green est visible
                 if sym == "G":
-                    reward += 0.2
+                    reward += rewards.see_green
                 elif sym == "R":
-                    reward -= 0.2
+                    reward += rewards.see_red
 
         # anti-boucle si trop longtemps sans manger
         if self.steps_without_food > self.max_steps_without_food:
             self.game_over = True
-            return -50.0, True
+            return rewards.timeout, True
 
-        self.update_grid()
         return reward, False
 
 
 
 
+    def step(self, action: int):
+        """
+        Move fusionne pour les boucles d'entrainement / d'evaluation.
+        action: int 0..3 (UP, RIGHT, DOWN, LEFT). Le shaping utilise la
+        vision courante (en cache si elle a deja ete lue), et la vision
+        apres le move est renvoyee: la boucle la reutilise comme etat
+        courant du step suivant, sans la recalculer.
+        Retourne: (next_state, reward, done), next_state = None si done.
+        """
+        state = self._state
+        if state is None:
+            state = self.get_state()
+        reward, done = self.move(STEP_DIRECTIONS[action], state, action)
+        if done:
+            return None, reward, True
+        return self.get_state(), reward, False
+
     def _cell_symbol(self, x, y):
-        if not (0 <= x < WIDTH and 0 <= y < HEIGHT):
+        w = self.width
+        if not (0 <= x < w and 0 <= y < self.height):
             return "W"
         if (x, y) == self.snake[0]:
             return "H"
-        if (x, y) in self.snake:
-            return "S"
-        if (x, y) in self.green_apples:
-            return "G"
-        if (x, y) == self.red_apple:
-            return "R"
-        return "0"
+        return _CELL_SYMBOLS[self.cells[y * w + x]]
 
     def _bucket_distance(self, d: int) -> int:
         """
@@ -215,46 +383,52 @@ class Environment:
         élément non-vide (G, R, S, W) rencontré.
         """
         x, y = self.snake[0]
-        distance = 0
-        
-        while True:
-            x += dx
-            y += dy
-            distance += 1
-            
-            # Mur atteint
-            if not (0 <= x < WIDTH and 0 <= y < HEIGHT):
-                return ("W", self._bucket_distance(distance))
-            
-            pos = (x, y)
-            
-            # Pomme verte
-            if pos in self.green_apples:
-                return ("G", self._bucket_distance(distance))
-            
-            # Pomme rouge
-            if pos == self.red_apple:
-                return ("R", self._bucket_distance(distance))
-            
-            # Corps du snake
-            if pos in self.snake:
-                return ("S", self._bucket_distance(distance))
-        
-        # Ne devrait jamais arriver (on finit toujours par un mur)
-        return ("W", self._bucket_distance(distance))
+        w = self.width
+        rays = self._rays
+
+        # Distance jusqu'au mur; ligne/colonne sans autre objet que la tete
+        if dy == 0:
+            limit = w - 1 - x if dx > 0 else x
+            if self.row_objects[y] == 1:
+                return rays[WALL][limit + 1]
+        else:
+            limit = self.height - 1 - y if dy > 0 else y
+            if self.col_objects[x] == 1:
+                return rays[WALL][limit + 1]
+
+        # Premier objet rencontre: pomme verte, rouge, corps ou mur
+        return _scan(self.cells, y * w + x, dx + dy * w, limit, rays)
 
     def get_state(self):
         """
         Retourne l'état vision du snake (4 directions).
         Format: ((symbol, distance_bucket), ...)
         Ordre: UP, RIGHT, DOWN, LEFT
+        Mis en cache jusqu'a la prochaine modification du plateau.
+        Les 4 rayons de look_direction, calcules en une passe.
         """
-        up = self.look_direction(0, -1)
-        right = self.look_direction(1, 0)
-        down = self.look_direction(0, 1)
-        left = self.look_direction(-1, 0)
-        
-        return (up, right, down, left)
+        state = self._state
+        if state is not None:
+            return state
+
+        x, y = self.snake[0]
+        w, h = self.width, self.height
+        rays = self._rays
+        wall = rays[WALL]
+        cells = self.cells
+        i = y * w + x
+        if self.row_objects[y] == 1:
+            right, left = wall[w - x], wall[x + 1]
+        else:
+            right = _scan(cells, i, 1, w - 1 - x, rays)
+            left = _scan(cells, i, -1, x, rays)
+        if self.col_objects[x] == 1:
+            up, down = wall[y + 1], wall[h - y]
+        else:
+            up = _scan(cells, i, -w, y, rays)
+            down = _scan(cells, i, w, h - 1 - y, rays)
+        state = self._state = (up, right, down, left)
+        return state
 
     def get_vision_display(self):
         """
@@ -271,8 +445,8 @@ class Environment:
         
         # Direction DOWN
         down_vision = []
-        for y in range(head_y + 1, HEIGHT + 1):
-            if y < HEIGHT:
+        for y in range(head_y + 1, self.height + 1):
+            if y < self.height:
                 down_vision.append(self._cell_symbol(head_x, y))
             else:
                 down_vision.append("W")
@@ -285,8 +459,8 @@ class Environment:
         
         # Direction RIGHT
         right_vision = []
-        for x in range(head_x + 1, WIDTH + 1):
-            if x < WIDTH:
+        for x in range(head_x + 1, self.width + 1):
+            if x < self.width:
                 right_vision.append(self._cell_symbol(x, head_y))
             else:
                 right_vision.append("W")
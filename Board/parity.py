@@ -0,0 +1,105 @@
+"""Parity check between BatchEnvironment.move() and Environment.move().
+
+Usage: python -m Board.parity [--steps 5000] [--envs 16] [--seed 0]
+
+Before every batch step, each board is copied into a scalar Environment,
+which plays the same action. Apple respawns draw from different generators,
+so the two are compared on what does not depend on them (reward, done,
+snake body, steps without food, and the vision when the snake did not eat),
+then resynchronized. The steps reported by final_steps are compared with the
+number of moves played, the fatal one included.
+"""
+
+import argparse
+import random
+from typing import List, Tuple
+
+import numpy as np
+
+from Board.batch_environment import BatchEnvironment
+from Board.config import EnvConfig, DEFAULT_CONFIG
+from Board.environment import Environment, STEP_DIRECTIONS
+
+
+def _cells(env: BatchEnvironment, values) -> List[Tuple[int, int]]:
+    w = env.width
+    return [(int(c) % w, int(c) // w) for c in values]
+
+
+def _body(env: BatchEnvironment, k: int) -> List[Tuple[int, int]]:
+    ptr = (env.head_ptr[k] + np.arange(env.length[k])) % env.num_cells
+    return _cells(env, env.body[k, ptr])
+
+
+def _check(ok, what: str, where) -> None:
+    # pas d'assert: python -O les supprimerait
+    if not ok:
+        raise AssertionError(f"{what} differe (step, board, action) = {where}")
+
+
+def _mirror(env: BatchEnvironment, k: int, config: EnvConfig) -> Environment:
+    """Scalar Environment in the same position as board k."""
+    scalar = Environment(config, rng=random.Random(k))
+    scalar.snake.clear()
+    scalar.snake.extend(_body(env, k))
+    scalar.green_apples = _cells(env, env.green_apples[k])
+    scalar.red_apples = _cells(env, env.red_apples[k])
+    scalar.steps_without_food = int(env.steps_without_food[k])
+    scalar.update_grid()
+    return scalar
+
+
+def check_parity(steps: int = 5000, num_envs: int = 16, seed: int = 0,
+                 config: EnvConfig = DEFAULT_CONFIG) -> int:
+    """
+    Play steps batch steps with random actions. Raises AssertionError on the
+    first divergence; returns the number of finished games compared.
+    """
+    env = BatchEnvironment(num_envs, config, seed=seed)
+    rng = np.random.default_rng(seed + 1)
+    moves = np.zeros(num_envs, dtype=np.int64)
+    games = 0
+
+    for step in range(steps):
+        actions = rng.integers(0, 4, size=num_envs)
+        mirrors = [_mirror(env, k, config) for k in range(num_envs)]
+        states = [env.state_tuple(k) for k in range(num_envs)]
+        rewards, dones = env.move(actions)
+        moves += 1
+
+        for k, scalar in enumerate(mirrors):
+            a = int(actions[k])
+            _check(scalar.get_state() == states[k], "vision", (step, k, a))
+            length = len(scalar.snake)
+            reward, done = scalar.move(STEP_DIRECTIONS[a], states[k], a)
+            where = (step, k, a)
+            _check(done == bool(dones[k]), "done", where)
+            _check(np.isclose(reward, rewards[k]), f"reward {reward} / {rewards[k]}", where)
+            if done:
+                _check(env.final_lengths[k] == len(scalar.snake), "final_lengths", where)
+                _check(env.final_steps[k] == moves[k],
+                       f"final_steps {env.final_steps[k]} / {moves[k]}", where)
+                moves[k] = 0
+                games += 1
+                continue
+            _check(_body(env, k) == list(scalar.snake), "body", where)
+            _check(env.steps_without_food[k] == scalar.steps_without_food,
+                   "steps_without_food", where)
+            if len(scalar.snake) == length:
+                # pas de pomme mangee: plateau identique
+                _check(env.state_tuple(k) == scalar.get_state(), "vision apres move", where)
+    return games
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parite BatchEnvironment / Environment")
+    parser.add_argument("--steps", type=int, default=5000)
+    parser.add_argument("--envs", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    games = check_parity(args.steps, args.envs, args.seed)
+    print(f"OK: {args.steps} steps x {args.envs} boards, {games} parties comparees")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,28 @@ from agent.agent import (
     choose_action,
     update_q,
 )
+from agent.encoding import (
+    NUM_STATES,
+    TERMINAL_STATE_INDEX,
+    ENCODING_VERSION,
+    encode_state,
+    decode_state,
+    encode_batch,
+)
+from agent.dense import (
+    DenseQTable,
+    SparseQTable,
+    init_state_dense,
+    safe_actions_from_index,
+    choose_action_dense,
+    update_q_dense,
+)
+from agent.batch_policy import (
+    SAFE_MASK,
+    choose_actions,
+)
+from agent.replay import ReplayBuffer, ReplaySchedule, replay_update
+from agent.pruning import compact, evict, footprint
 
 __all__ = [
     "QTable",
@@ -14,4 +36,24 @@ __all__ = [
     "safe_actions_from_state",
     "choose_action",
     "update_q",
+    "NUM_STATES",
+    "TERMINAL_STATE_INDEX",
+    "ENCODING_VERSION",
+    "encode_state",
+    "decode_state",
+    "encode_batch",
+    "DenseQTable",
+    "SparseQTable",
+    "init_state_dense",
+    "safe_actions_from_index",
+    "choose_action_dense",
+    "update_q_dense",
+    "SAFE_MASK",
+    "choose_actions",
+    "ReplayBuffer",
+    "ReplaySchedule",
+    "replay_update",
+    "compact",
+    "evict",
+    "footprint",
 ]
@@ -28,13 +28,14 @@ def safe_actions_from_state(state: Tuple) -> List[int]:
     return safe if safe else [0, 1, 2, 3]
 
 
-def choose_action(q: QTable, state: Tuple, epsilon: float, use_safety: bool) -> int:
+def choose_action(q: QTable, state: Tuple, epsilon: float, use_safety: bool,
+                  rng=random) -> int:
     """Choose action using epsilon-greedy policy."""
-    if random.random() < epsilon:
+    if rng.random() < epsilon:
         if use_safety:
             safe = safe_actions_from_state(state)
-            return random.choice(safe)
-        return random.randint(0, 3)
+            return rng.choice(safe)
+        return rng.randint(0, 3)
 
     values = q[state]
     max_v = max(values)
@@ -43,9 +44,9 @@ def choose_action(q: QTable, state: Tuple, epsilon: float, use_safety: bool) ->
     if use_safety:
         safe = safe_actions_from_state(state)
         best_safe = [a for a in best if a in safe]
-        return random.choice(best_safe) if best_safe else random.choice(best)
+        return rng.choice(best_safe) if best_safe else rng.choice(best)
 
-    return random.choice(best)
+    return rng.choice(best)
 
 
 def update_q(q, state, action, reward, next_state, alpha, gamma, done=False):
@@ -0,0 +1,49 @@
+"""Vectorized epsilon-greedy policy over arrays of encoded states.
+
+choose_actions() is the batched counterpart of choose_action_dense: same
+distribution (uniform tie-break among the best actions, safety filter on the
+ties, uniform safe exploration), drawn with a NumPy Generator.
+"""
+
+from typing import Union
+
+import numpy as np
+
+from agent.dense import DenseQTable, SparseQTable, SAFE_MASK
+
+
+def random_choice(candidates: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Uniform pick of one True column per row of a bool [n, 4] array."""
+    keys = rng.random(candidates.shape)
+    keys[~candidates] = -1.0
+    return keys.argmax(axis=1)
+
+
+def greedy_actions(values: np.ndarray, states: np.ndarray, use_safety: bool,
+                   rng: np.random.Generator) -> np.ndarray:
+    """Argmax of each row of `values`, ties broken at random.
+    With use_safety, ties are first restricted to the safe actions."""
+    best = values == values.max(axis=1, keepdims=True)
+    if use_safety:
+        best_safe = best & SAFE_MASK[states]
+        has_safe = best_safe.any(axis=1)
+        best[has_safe] = best_safe[has_safe]
+    return random_choice(best, rng)
+
+
+def choose_actions(q: Union[DenseQTable, SparseQTable], states: np.ndarray,
+                   epsilon: float, use_safety: bool,
+                   rng: np.random.Generator) -> np.ndarray:
+    """choose_action_dense for an array of encoded states. Returns int64 [n]."""
+    states = np.asarray(states, dtype=np.int64)
+    values, _ = q.lookup(states)
+    actions = greedy_actions(values, states, use_safety, rng)
+
+    if epsilon > 0.0:
+        explore = rng.random(len(states)) < epsilon
+        if explore.any():
+            if use_safety:
+                actions[explore] = random_choice(SAFE_MASK[states[explore]], rng)
+            else:
+                actions[explore] = rng.integers(0, 4, size=int(explore.sum()))
+    return actions
@@ -0,0 +1,256 @@
+"""Dense array-backed Q-table indexed by encoded states."""
+
+import random
+from typing import List, Tuple
+
+import numpy as np
+
+from agent.agent import QTable
+from agent.encoding import (
+    NUM_STATES,
+    RAY_CODES,
+    NUM_BUCKETS,
+    encode_state,
+    decode_state,
+)
+
+# Codes de rayon "mur/corps a distance 1"
+_DANGER_CODES = (2 * NUM_BUCKETS, 3 * NUM_BUCKETS)
+
+
+def _safe_mask() -> np.ndarray:
+    """bool[NUM_STATES, 4]: safe actions of every encoded state."""
+    states = np.arange(NUM_STATES)
+    codes = np.stack([(states // RAY_CODES ** a) % RAY_CODES for a in range(4)],
+                     axis=1)
+    safe = ~np.isin(codes, _DANGER_CODES)
+    # aucune action sure: toutes autorisees
+    safe[~safe.any(axis=1)] = True
+    return safe
+
+
+SAFE_MASK = _safe_mask()
+# Bit a = action a sure (bytes: l'indexation renvoie un int Python)
+SAFE_BITS = (SAFE_MASK @ np.array([1, 2, 4, 8])).astype(np.uint8).tobytes()
+
+# Sous-ensemble d'actions (tuple partage) pour chaque masque de 4 bits
+_SUBSETS = tuple(
+    tuple(a for a in range(4) if bits >> a & 1) for bits in range(16)
+)
+SAFE_ACTIONS = [_SUBSETS[bits] for bits in SAFE_BITS]
+
+# (greedy, greedy_safe) pour chaque (masque des meilleures actions, masque sur)
+_CANDIDATES = tuple(
+    tuple((_SUBSETS[best], _SUBSETS[best & safe or best]) for safe in range(16))
+    for best in range(16)
+)
+
+
+def greedy_candidates(values: List[float],
+                      safe_bits: int) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """(best actions, best safe actions or best if none is safe), as shared tuples."""
+    v0, v1, v2, v3 = values
+    m = max(v0, v1, v2, v3)
+    best = (v0 == m) | (v1 == m) << 1 | (v2 == m) << 2 | (v3 == m) << 3
+    return _CANDIDATES[best][safe_bits]
+
+
+class DenseQTable:
+    """
+    Q-values in a float32[NUM_STATES, 4] array.
+    `seen` marks the states initialized by init_state_dense (the keys of
+    the equivalent dict QTable). `flat` is a memoryview over the values
+    (index state * 4 + action) used by the scalar hot path: it reads and
+    writes plain Python floats without creating NumPy scalars; `seen_flat`
+    is the same for `seen`.
+    `visits[state]` counts the updates of the state (update_q_dense), for
+    agent.pruning.
+    `candidates[state]` caches greedy_candidates() of the state; writes that
+    bypass update_q_dense must call invalidate().
+    """
+
+    def __init__(self, values: np.ndarray = None, seen: np.ndarray = None,
+                 visits: np.ndarray = None):
+        if values is None:
+            values = np.zeros((NUM_STATES, 4), dtype=np.float32)
+        if seen is None:
+            seen = np.zeros(NUM_STATES, dtype=bool)
+        if visits is None:
+            visits = np.zeros(NUM_STATES, dtype=np.uint32)
+        self.values = values
+        self.seen = seen
+        self.visits = visits
+        self.flat = memoryview(values.reshape(-1))
+        self.seen_flat = memoryview(seen)
+        self.visits_flat = memoryview(visits)
+        self.candidates: list = [None] * NUM_STATES
+
+    def __getstate__(self):
+        return self.values, self.seen, self.visits
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.seen))
+
+    def __contains__(self, index: int) -> bool:
+        return self.seen_flat[index]
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self.values[index]
+
+    def row(self, index: int) -> List[float]:
+        """Q-values of a state as a list of 4 floats."""
+        i = index * 4
+        return self.flat[i:i + 4].tolist()
+
+    def lookup(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Batched row(): (values [n, 4], seen [n]) for an array of states."""
+        return self.values[indices], self.seen[indices]
+
+    def invalidate(self, indices=None) -> None:
+        """Drop the cached candidates of `indices` (all states if None)."""
+        if indices is None:
+            self.candidates = [None] * NUM_STATES
+            return
+        candidates = self.candidates
+        for index in np.asarray(indices).tolist():
+            candidates[index] = None
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.seen.nbytes + self.visits.nbytes
+
+    def copy(self) -> "DenseQTable":
+        return DenseQTable(self.values.copy(), self.seen.copy(),
+                           self.visits.copy())
+
+    def to_dense(self) -> "DenseQTable":
+        return self
+
+    @classmethod
+    def from_dict(cls, q: QTable) -> "DenseQTable":
+        """Build from a dict QTable keyed by vision tuples."""
+        table = cls()
+        for state, values in q.items():
+            index = encode_state(state)
+            table.values[index] = values
+            table.seen[index] = True
+        return table
+
+    def to_dict(self) -> QTable:
+        """Dict QTable with one entry per seen state."""
+        return {
+            decode_state(int(index)): self.values[index].tolist()
+            for index in np.flatnonzero(self.seen)
+        }
+
+
+class SparseQTable:
+    """
+    Read-only Q-table over a sorted array of encoded states and the matching
+    float32[n, 4] value block, e.g. memory-mapped from a model file.
+    Same lookup interface as DenseQTable (`in`, len, row).
+    `visits`: uint32[n] visit counters, or None if the model has none.
+    """
+
+    def __init__(self, keys: np.ndarray, values: np.ndarray,
+                 visits: np.ndarray = None):
+        self.keys = keys
+        self.values = values
+        self.visits = visits
+        self.candidates: list = [None] * NUM_STATES
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _slot(self, index: int) -> int:
+        slot = int(self.keys.searchsorted(index))
+        if slot < len(self.keys) and self.keys[slot] == index:
+            return slot
+        return -1
+
+    def __contains__(self, index: int) -> bool:
+        return self._slot(index) >= 0
+
+    def row(self, index: int) -> List[float]:
+        slot = self._slot(index)
+        if slot < 0:
+            return [0.0, 0.0, 0.0, 0.0]
+        return self.values[slot].tolist()
+
+    def lookup(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Batched row(): (values [n, 4], known [n]), zeros for unknown states."""
+        if len(self.keys) == 0:
+            return (np.zeros((len(indices), 4), dtype=np.float32),
+                    np.zeros(len(indices), dtype=bool))
+        slots = self.keys.searchsorted(indices)
+        slots = np.minimum(slots, len(self.keys) - 1)
+        known = self.keys[slots] == indices
+        values = np.where(known[:, None], self.values[slots], np.float32(0.0))
+        return values, known
+
+    @property
+    def nbytes(self) -> int:
+        extra = self.visits.nbytes if self.visits is not None else 0
+        return self.keys.nbytes + self.values.nbytes + extra
+
+    def to_dense(self) -> DenseQTable:
+        """Writable copy as a DenseQTable."""
+        table = DenseQTable()
+        table.values[self.keys] = self.values
+        table.seen[self.keys] = True
+        if self.visits is not None:
+            table.visits[self.keys] = self.visits
+        return table
+
+    def to_dict(self) -> QTable:
+        return {
+            decode_state(int(index)): values.tolist()
+            for index, values in zip(self.keys, self.values)
+        }
+
+
+def init_state_dense(q: DenseQTable, state: int) -> None:
+    """Mark state as initialized (its values start at 0)."""
+    q.seen_flat[state] = True
+
+
+def safe_actions_from_index(state: int) -> Tuple[int, ...]:
+    """safe_actions_from_state for an encoded state (shared tuple)."""
+    return SAFE_ACTIONS[state]
+
+
+def choose_action_dense(q: DenseQTable, state: int, epsilon: float,
+                        use_safety: bool, rng=random) -> int:
+    """choose_action for an encoded state.
+    The greedy and safe candidate sets come from the table's cache, so a
+    step allocates no list."""
+    if rng.random() < epsilon:
+        if use_safety:
+            return rng.choice(SAFE_ACTIONS[state])
+        return rng.randint(0, 3)
+
+    pair = q.candidates[state]
+    if pair is None:
+        pair = q.candidates[state] = greedy_candidates(q.row(state),
+                                                       SAFE_BITS[state])
+    return rng.choice(pair[1] if use_safety else pair[0])
+
+
+def update_q_dense(q: DenseQTable, state: int, action: int, reward: float,
+                   next_state: int, alpha: float, gamma: float,
+                   done: bool = False) -> None:
+    """update_q for encoded states."""
+    flat = q.flat
+    if done:
+        best_next = 0.0
+    else:
+        j = next_state * 4
+        best_next = max(flat[j], flat[j + 1], flat[j + 2], flat[j + 3])
+    i = state * 4 + action
+    old = flat[i]
+    flat[i] = old + alpha * (reward + gamma * best_next - old)
+    q.candidates[state] = None
+    q.visits_flat[state] += 1
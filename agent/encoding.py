@@ -0,0 +1,61 @@
+"""Integer encoding of the vision state.
+
+Each ray (symbol, distance_bucket) maps to a code in [0, RAY_CODES), the
+terminal marker ("T", 0) included, and a state is the base-RAY_CODES number
+formed by its four rays (UP is the least significant digit).
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from Board.batch_environment import SYMBOLS
+
+NUM_BUCKETS = 3
+RAY_CODES = len(SYMBOLS) * NUM_BUCKETS + 1
+TERMINAL_RAY = RAY_CODES - 1
+NUM_STATES = RAY_CODES ** 4
+TERMINAL_STATE_INDEX = TERMINAL_RAY * (1 + RAY_CODES + RAY_CODES ** 2 + RAY_CODES ** 3)
+
+# Incremente quand le mapping state -> index change (stocke avec les modeles)
+ENCODING_VERSION = 1
+
+_RAY_TO_CODE = {
+    (sym, bucket): s * NUM_BUCKETS + bucket - 1
+    for s, sym in enumerate(SYMBOLS)
+    for bucket in range(1, NUM_BUCKETS + 1)
+}
+_RAY_TO_CODE[("T", 0)] = TERMINAL_RAY
+_CODE_TO_RAY = {code: ray for ray, code in _RAY_TO_CODE.items()}
+
+_RAY_WEIGHTS = np.array([1, RAY_CODES, RAY_CODES ** 2, RAY_CODES ** 3],
+                        dtype=np.int64)
+
+
+def encode_ray(sym: str, bucket: int) -> int:
+    """Code of one ray."""
+    return _RAY_TO_CODE[(sym, bucket)]
+
+
+def encode_state(state: Tuple) -> int:
+    """Map a vision state (4 rays, order UP, RIGHT, DOWN, LEFT) to its index."""
+    code = _RAY_TO_CODE
+    return (code[state[0]]
+            + RAY_CODES * (code[state[1]]
+                           + RAY_CODES * (code[state[2]]
+                                          + RAY_CODES * code[state[3]])))
+
+
+def decode_state(index: int) -> Tuple:
+    """Inverse of encode_state."""
+    rays = []
+    for _ in range(4):
+        index, code = divmod(index, RAY_CODES)
+        rays.append(_CODE_TO_RAY[code])
+    return tuple(rays)
+
+
+def encode_batch(symbols: np.ndarray, buckets: np.ndarray) -> np.ndarray:
+    """Vectorized encode_state for BatchEnvironment.get_state() arrays."""
+    codes = symbols.astype(np.int64) * NUM_BUCKETS + buckets - 1
+    return codes @ _RAY_WEIGHTS
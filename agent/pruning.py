@@ -0,0 +1,76 @@
+"""Visit-based pruning of the Q-table: compaction pass and size cap.
+
+A state that is dropped goes back to "never seen": training re-initializes
+it at 0 on its next visit, and evaluation plays a random action there
+(as for any unknown state). compact() only drops states that were rarely
+updated AND whose values are still within `tolerance` of that
+initialization, so what is lost is indistinguishable from what a new visit
+would rebuild. evict() enforces a maximum number of states during training
+by dropping the least-visited ones.
+
+The DenseQTable array itself has a fixed size (NUM_STATES rows); what these
+passes bound is the number of live states, i.e. the size of the saved model
+and of its memory-mapped SparseQTable.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+from agent.dense import DenseQTable
+
+# Bytes per state in the model format: key uint32 + 4 x float32, plus a
+# uint32 visit counter when the table has counted visits (utils.io)
+STATE_BYTES = 4 + 16
+VISITS_BYTES = 4
+
+# evict() descend a (1 - EVICT_SLACK) * max_states pour ne pas evincer a
+# chaque episode
+EVICT_SLACK = 0.1
+
+
+def footprint(q: DenseQTable) -> Dict[str, int]:
+    """Live states, their size in the model format, and the dense array size."""
+    states = len(q)
+    per_state = STATE_BYTES + (VISITS_BYTES if q.visits.any() else 0)
+    return {"states": states, "sparse_bytes": states * per_state,
+            "dense_bytes": q.nbytes}
+
+
+def drop_states(q: DenseQTable, indices: np.ndarray) -> None:
+    """Return states to "never seen" (values 0, no visits)."""
+    q.values[indices] = 0.0
+    q.seen[indices] = False
+    q.visits[indices] = 0
+    q.invalidate(indices)
+
+
+def compact(q: DenseQTable, min_visits: int = 3, tolerance: float = 0.5) -> int:
+    """
+    Drop the seen states visited fewer than min_visits times whose values
+    all stay within `tolerance` of 0. Returns the number of dropped states.
+    """
+    seen = np.flatnonzero(q.seen)
+    rare = q.visits[seen] < min_visits
+    flat = np.abs(q.values[seen]).max(axis=1) <= tolerance
+    dropped = seen[rare & flat]
+    drop_states(q, dropped)
+    return len(dropped)
+
+
+def evict(q: DenseQTable, max_states: int) -> int:
+    """
+    If more than max_states states are seen, drop the least-visited ones
+    (ties: smallest |Q| first) down to (1 - EVICT_SLACK) * max_states.
+    Returns the number of evicted states.
+    """
+    seen = np.flatnonzero(q.seen)
+    if len(seen) <= max_states:
+        return 0
+    keep = int(max_states * (1 - EVICT_SLACK))
+    excess = len(seen) - keep
+    # lexsort: derniere cle = cle primaire
+    order = np.lexsort((np.abs(q.values[seen]).max(axis=1), q.visits[seen]))
+    evicted = seen[order[:excess]]
+    drop_states(q, evicted)
+    return excess
@@ -0,0 +1,152 @@
+"""Experience replay for the dense Q-table.
+
+Transitions (encoded state, action, reward, next state, done) go into
+fixed-size NumPy arrays used as a circular buffer. replay_update() samples a
+minibatch and applies the TD updates in one vectorized pass; with
+prioritized sampling, transitions are drawn proportionally to
+|TD error| ** priority_exponent and weighted by importance sampling.
+ReplaySchedule runs those minibatches between the steps of an episode.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from agent.dense import DenseQTable
+
+
+class ReplayBuffer:
+    """Circular transition buffer. The oldest transitions are overwritten."""
+
+    def __init__(self, capacity: int, prioritized: bool = False,
+                 priority_exponent: float = 0.6, is_exponent: float = 0.4,
+                 seed: Optional[int] = None):
+        if capacity < 1:
+            raise ValueError("La capacite du replay buffer doit etre >= 1")
+        self.capacity = capacity
+        self.prioritized = prioritized
+        self.priority_exponent = priority_exponent
+        self.is_exponent = is_exponent
+        self.rng = np.random.default_rng(seed)
+
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.dones = np.zeros(capacity, dtype=bool)
+        # deja elevees a priority_exponent
+        self.priorities = np.zeros(capacity, dtype=np.float64)
+        self._max_priority = 1.0
+
+        self.pos = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, state: int, action: int, reward: float, next_state: int,
+            done: bool) -> None:
+        i = self.pos
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        # une transition neuve est tiree au moins une fois en priorite
+        self.priorities[i] = self._max_priority
+        self.pos = (i + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def sample(self, batch_size: int):
+        """Indices of a minibatch and their importance-sampling weights."""
+        if not self.prioritized:
+            indices = self.rng.integers(0, self.size, size=batch_size)
+            return indices, None
+
+        cdf = np.cumsum(self.priorities[:self.size])
+        total = cdf[-1]
+        indices = cdf.searchsorted(self.rng.random(batch_size) * total, side="right")
+        indices = np.minimum(indices, self.size - 1)
+        probs = self.priorities[indices] / total
+        weights = (self.size * probs) ** -self.is_exponent
+        return indices, weights / weights.max()
+
+    def update_priorities(self, indices: np.ndarray, td: np.ndarray) -> None:
+        priorities = (np.abs(td) + 1e-3) ** self.priority_exponent
+        self.priorities[indices] = priorities
+        self._max_priority = max(self._max_priority, float(priorities.max()))
+
+
+def replay_update(q: DenseQTable, buffer: ReplayBuffer, batch_size: int,
+                  alpha: float, gamma: float) -> float:
+    """
+    One vectorized minibatch of Q-learning updates.
+    Duplicate (state, action) pairs in the batch get the mean of their
+    updates: their TD errors all come from the same value, so summing them
+    would multiply the step by the number of copies (and diverge once it
+    exceeds 1 / alpha). Like update_q_dense, every applied transition counts
+    as a visit of its state; transitions from a state that is no longer
+    seen (evicted by agent.pruning) are skipped, the state will be
+    re-initialized at its next visit. Returns the mean |TD error| of the batch.
+    """
+    if buffer.size == 0:
+        return 0.0
+    indices, weights = buffer.sample(batch_size)
+    live = q.seen[buffer.states[indices]]
+    if not live.all():
+        if buffer.prioritized:
+            # sinon ces transitions garderaient leur priorite et
+            # monopoliseraient les tirages sans jamais etre appliquees
+            buffer.update_priorities(indices[~live], np.zeros(int((~live).sum())))
+        indices = indices[live]
+        if weights is not None:
+            weights = weights[live]
+        if indices.size == 0:
+            return 0.0
+    states = buffer.states[indices]
+    actions = buffer.actions[indices]
+    next_states = buffer.next_states[indices]
+
+    best_next = q.values[next_states].max(axis=1)
+    best_next[buffer.dones[indices]] = 0.0
+    targets = buffer.rewards[indices] + gamma * best_next
+    td = targets - q.values[states, actions]
+
+    step = alpha * td if weights is None else alpha * weights * td
+    cells, inverse, counts = np.unique(states * 4 + actions, return_inverse=True,
+                                       return_counts=True)
+    mean_step = np.bincount(inverse, weights=step) / counts
+    q.values.reshape(-1)[cells] += mean_step.astype(np.float32)
+    np.add.at(q.visits, states, 1)
+    q.invalidate(states)
+
+    if buffer.prioritized:
+        buffer.update_priorities(indices, td)
+    return float(np.abs(td).mean())
+
+
+class ReplaySchedule:
+    """
+    Replay interleaved with the environment steps: every transition goes
+    into the buffer and, every `every` transitions, one minibatch of
+    batch_size transitions is replayed, so the rest of the episode already
+    plays with the replayed values.
+    """
+
+    def __init__(self, buffer: ReplayBuffer, batch_size: int, every: int,
+                 alpha: float, gamma: float):
+        self.buffer = buffer
+        self.batch_size = batch_size
+        self.every = every
+        self.alpha = alpha
+        self.gamma = gamma
+        self.pending = 0
+
+    def add(self, q: DenseQTable, state: int, action: int, reward: float,
+            next_state: int, done: bool) -> None:
+        self.buffer.add(state, action, reward, next_state, done)
+        self.pending += 1
+        if self.pending >= self.every:
+            self.pending = 0
+            replay_update(q, self.buffer, self.batch_size, self.alpha, self.gamma)
@@ -4,13 +4,11 @@ import os
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
 
 import argparse
+import atexit
 import random
+import sys
 
-from modes.game_modes import (
-    train_mode,
-    evaluate_mode,
-    visual_mode,
-)
+from Board.config import EnvConfig, RewardTable
 
 
 def main() -> None:
@@ -21,41 +19,244 @@ def main() -> None:
     mode.add_argument("--train", action="store_true", help="Mode entrainement")
     mode.add_argument("--evaluate", action="store_true", help="Mode evaluation (dontlearn)")
     mode.add_argument("--visual", action="store_true", help="Mode visualisation")
+    mode.add_argument("--bench", action="store_true", help="Mode benchmark")
+    mode.add_argument("--replay", type=str, metavar="FICHIER",
+                      help="Rejoue un enregistrement .l2sr")
+    mode.add_argument("--sweep", type=str, metavar="CONFIG",
+                      help="Recherche d'hyperparametres decrite par un fichier JSON")
 
     parser.add_argument("--load", type=str, default="", help="Charger modele (eval/visual)")
-    parser.add_argument("--save", type=str, default="", help="Sauver modele (train)")
+    parser.add_argument("--save", type=str, default="",
+                        help="Sauver modele (train), dossier des resultats (sweep)")
     parser.add_argument("--episodes", type=int, default=2000, help="Nb episodes entrainement")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Nb processus d'entrainement, ou d'essais simultanes en sweep (defaut: 1)")
+    parser.add_argument("--sync-every", type=int, default=100,
+                        help="Episodes entre deux fusions de Q (defaut: 100)")
+    parser.add_argument("--alpha", type=float, default=0.2, help="Taux d'apprentissage (defaut: 0.2)")
+    parser.add_argument("--gamma", type=float, default=0.95, help="Facteur d'actualisation (defaut: 0.95)")
+    parser.add_argument("--eps-start", type=float, default=0.4, help="Epsilon initial (defaut: 0.4)")
+    parser.add_argument("--eps-end", type=float, default=0.05, help="Epsilon final (defaut: 0.05)")
+    parser.add_argument("--reward", type=str, action="append", default=[],
+                        metavar="NOM=VALEUR",
+                        help="Remplace un reward, par ex. --reward green=30 (repetable)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reprend l'entrainement (checkpoint de --save, sinon --load)")
+    parser.add_argument("--checkpoint-every", type=int, default=0,
+                        help="Snapshot incremental tous les N episodes (train)")
+    parser.add_argument("--replay-size", type=int, default=0,
+                        help="Experience replay: capacite du buffer (train, 0 = off)")
+    parser.add_argument("--replay-batch", type=int, default=64,
+                        help="Transitions par minibatch de replay (defaut: 64)")
+    parser.add_argument("--replay-every", type=int, default=8,
+                        help="Steps entre deux minibatchs de replay (defaut: 8)")
+    parser.add_argument("--prioritized", action="store_true",
+                        help="Replay priorise par l'erreur TD")
+    parser.add_argument("--max-states", type=int, default=0,
+                        help="Nb max d'etats de la Q-table, eviction des moins visites (train)")
+    parser.add_argument("--eval-every", type=int, default=0,
+                        help="Evalue la Q courante tous les N episodes dans un processus a part (train)")
+    parser.add_argument("--eval-games", type=int, default=100,
+                        help="Parties par evaluation periodique, >= 2 (defaut: 100)")
+    parser.add_argument("--metrics", type=str, default="",
+                        help="Metriques par episode/partie (.jsonl ou .csv)")
 
     parser.add_argument("--games", type=int, default=100, help="Nb parties evaluation")
+    parser.add_argument("--eval-workers", type=int, default=1,
+                        help="Nb processus d'evaluation (defaut: 1)")
+    parser.add_argument("--batch-envs", type=int, default=0,
+                        help="Evaluation vectorisee sur N boards (NumPy)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed de base: entrainement, evaluation et visualisation reproductibles")
+
+    parser.add_argument("--target-ci", type=float, default=0.0,
+                        help="Evaluation sequentielle: s'arrete quand l'IC de la longueur "
+                             "moyenne est plus etroit (--games = maximum)")
+    parser.add_argument("--compare", type=str, default="",
+                        help="Modele de reference joue sur les memes seeds: s'arrete des "
+                             "que l'ecart est significatif (evaluate)")
+    parser.add_argument("--min-games", type=int, default=30,
+                        help="Parties avant le premier test d'arret (defaut: 30)")
+    parser.add_argument("--confidence", type=float, default=0.95,
+                        help="Niveau de confiance des intervalles (defaut: 0.95)")
+
+    parser.add_argument("--record", type=str, default="",
+                        help="Dossier ou enregistrer la meilleure et la pire partie (evaluate)")
+    parser.add_argument("--seek", type=int, default=0,
+                        help="Premier step affiche (replay)")
 
     parser.add_argument("--window", action="store_true", help="Fenetre pygame")
-    parser.add_argument("--fps", type=int, default=10, help="FPS pygame (defaut: 10)")
+    parser.add_argument("--fps", type=int, default=10, help="FPS d'affichage, pygame ou ASCII (defaut: 10, 0 = max)")
     parser.add_argument("--step", action="store_true", help="Step-by-step pygame")
     parser.add_argument("--no-safety", action="store_true", help="Desactive safety filter en evaluation")
 
+    parser.add_argument("--width", type=int, default=10, help="Largeur du plateau (defaut: 10)")
+    parser.add_argument("--height", type=int, default=10, help="Hauteur du plateau (defaut: 10)")
+    parser.add_argument("--green-apples", type=int, default=2, help="Nb pommes vertes (defaut: 2)")
+    parser.add_argument("--red-apples", type=int, default=1, help="Nb pommes rouges (defaut: 1)")
+    parser.add_argument("--max-steps-without-food", type=int, default=100,
+                        help="Steps sans manger avant game over (defaut: 100)")
+
+    parser.add_argument("--bench-out", type=str, default="bench_results.json",
+                        help="Fichier JSON des resultats (bench)")
+    parser.add_argument("--baseline", type=str, default="",
+                        help="Resultats de reference a comparer (bench)")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Baisse toleree vs baseline (defaut: 0.15)")
+    parser.add_argument("--bench-sizes", type=str, default="10x10,20x20,40x40",
+                        help="Tailles de plateau (bench)")
+    parser.add_argument("--profile-import", action="store_true",
+                        help="Affiche le temps d'import de chaque module")
+    parser.add_argument("--profile", action="store_true",
+                        help="Temps par phase d'un step (train/evaluate)")
+    parser.add_argument("--profile-out", type=str, default="",
+                        help="Execute sous cProfile et ecrit les stats (train/evaluate)")
+
     args = parser.parse_args()
 
+    if args.profile_import:
+        from utils.importprof import ImportProfiler
+        profiler = ImportProfiler().__enter__()
+        atexit.register(lambda: print(profiler.report(), file=sys.stderr))
+
+    # Les modes sont importes apres le parsing: --help et les erreurs
+    # d'arguments ne chargent ni numpy ni pygame
+
+    try:
+        rewards = {}
+        for item in args.reward:
+            name, _, value = item.partition("=")
+            try:
+                rewards[name.strip()] = float(value)
+            except ValueError:
+                raise ValueError(f"--reward attend NOM=VALEUR, recu: {item}")
+        config = EnvConfig(
+            width=args.width,
+            height=args.height,
+            green_apples=args.green_apples,
+            red_apples=args.red_apples,
+            max_steps_without_food=args.max_steps_without_food,
+            rewards=RewardTable().override(rewards),
+        )
+    except ValueError as e:
+        print(f"Erreur: {e}")
+        return
+
+    profiling = args.profile or args.profile_out
+    if profiling and (args.workers > 1 or args.eval_workers > 1):
+        print("Erreur: --profile / --profile-out demandent --workers 1 et --eval-workers 1")
+        return
+
+    def run(mode, *mode_args, **mode_kwargs) -> None:
+        if not profiling:
+            mode(*mode_args, **mode_kwargs)
+            return
+        from modes.profiling import profile_call
+        profile_call(mode, *mode_args, cprofile_path=args.profile_out or None,
+                     **mode_kwargs)
 
     if args.train:
         if not args.save:
             print("Erreur: --train demande --save models/xxx.pkl")
             return
-        train_mode(episodes=args.episodes, save_path=args.save)
+        if args.workers > 1 and (args.resume or args.checkpoint_every or args.metrics
+                                 or args.replay_size or args.eval_every
+                                 or args.max_states):
+            print("Erreur: --resume / --checkpoint-every / --metrics / --replay-size / "
+                  "--eval-every / --max-states demandent --workers 1")
+            return
+        if args.eval_every and args.eval_games < 2:
+            # une seule partie ne donne pas d'intervalle de confiance
+            print("Erreur: --eval-games doit etre >= 2")
+            return
+        if args.replay_size and (args.resume or args.checkpoint_every):
+            # le buffer de replay et son RNG ne sont pas dans le checkpoint:
+            # une reprise repartirait d'un buffer vide, sans reproductibilite
+            print("Erreur: --resume / --checkpoint-every ne supportent pas --replay-size")
+            return
+        from modes.game_modes import train_mode
+        resume_from = None
+        if args.resume:
+            resume_from = args.load or args.save
+        run(train_mode, episodes=args.episodes, save_path=args.save,
+            alpha=args.alpha, gamma=args.gamma, eps_start=args.eps_start,
+            eps_end=args.eps_end, config=config,
+            workers=args.workers, sync_every=args.sync_every,
+            resume_from=resume_from,
+            checkpoint_every=args.checkpoint_every,
+            metrics_path=args.metrics or None,
+            replay_size=args.replay_size, replay_batch=args.replay_batch,
+            replay_every=args.replay_every, prioritized=args.prioritized,
+            seed=args.seed, eval_every=args.eval_every, eval_games=args.eval_games,
+            max_states=args.max_states)
         return
 
     if args.evaluate:
         if not args.load:
             print("Erreur: --evaluate demande --load models/xxx.pkl")
             return
-        evaluate_mode(args.games, args.load, use_safety=(not args.no_safety))
+        if args.record and args.batch_envs > 1:
+            print("Erreur: --record demande des parties seedees (sans --batch-envs)")
+            return
+        if args.target_ci > 0 or args.compare:
+            if args.record or args.batch_envs > 1:
+                print("Erreur: --target-ci / --compare ne supportent ni --record ni --batch-envs")
+                return
+            from modes.sequential import sequential_evaluate_mode
+            try:
+                run(sequential_evaluate_mode, args.load, args.games,
+                    use_safety=(not args.no_safety), config=config,
+                    workers=args.eval_workers, seed=args.seed,
+                    target_ci=args.target_ci, baseline_path=args.compare or None,
+                    min_games=args.min_games, confidence=args.confidence,
+                    metrics_path=args.metrics or None)
+            except ValueError as e:
+                print(f"Erreur: {e}")
+            return
+        from modes.game_modes import evaluate_mode
+        run(evaluate_mode, args.games, args.load, use_safety=(not args.no_safety),
+            config=config, workers=args.eval_workers, seed=args.seed,
+            metrics_path=args.metrics or None, batch_envs=args.batch_envs,
+            record_dir=args.record or None)
+        return
+
+    if args.bench:
+        from modes.bench import bench_mode
+        try:
+            sizes = [tuple(int(v) for v in size.split("x"))
+                     for size in args.bench_sizes.split(",")]
+        except ValueError:
+            print("Erreur: --bench-sizes attend par ex. 10x10,20x20")
+            return
+        ok = bench_mode(args.bench_out, baseline_path=args.baseline or None,
+                        tolerance=args.tolerance, sizes=sizes)
+        if not ok:
+            sys.exit(1)
+        return
+
+    if args.sweep:
+        from modes.sweep import sweep_mode
+        try:
+            sweep_mode(args.sweep, config=config, workers=args.workers,
+                       use_safety=(not args.no_safety),
+                       out_dir=args.save or None)
+        except ValueError as e:
+            print(f"Erreur: {e}")
+        return
+
+    if args.replay:
+        from modes.playback import replay_mode
+        replay_mode(args.replay, use_window=args.window, fps=args.fps,
+                    step_by_step=args.step, seek=args.seek)
         return
 
     if args.visual:
         if not args.load:
             print("Erreur: --visual demande --load models/xxx.pkl")
             return
+        from modes.game_modes import visual_mode
         visual_mode(args.load, use_window=args.window, fps=args.fps,
-                    step_by_step=args.step)
+                    step_by_step=args.step, config=config, seed=args.seed)
         return
 
 
@@ -0,0 +1,42 @@
+"""Batched evaluation: K boards of BatchEnvironment driven by choose_actions."""
+
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from Board.batch_environment import BatchEnvironment
+from Board.config import EnvConfig
+from agent.batch_policy import choose_actions
+from agent.encoding import encode_batch
+from utils.io import ModelTable
+
+
+def batch_evaluate(q: ModelTable, num_games: int, use_safety: bool,
+                   config: EnvConfig, num_envs: int,
+                   seed: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """
+    Joue num_games parties greedy sur num_envs boards avances ensemble.
+    Chaque board joue un quota fixe de parties (les parties en trop d'un
+    board deja servi sont ignorees), pour ne pas favoriser les parties
+    courtes. Comme play_evaluation_game, un etat absent de Q donne une
+    action uniforme. Renvoie (length, steps) dans l'ordre de fin.
+    """
+    num_envs = max(1, min(num_envs, num_games))
+    quota = np.full(num_envs, num_games // num_envs, dtype=np.int64)
+    quota[:num_games % num_envs] += 1
+
+    env = BatchEnvironment(num_envs, config, seed=seed)
+    rng = np.random.default_rng(None if seed is None else seed + 1)
+
+    while quota.any():
+        states = encode_batch(*env.get_state())
+        actions = choose_actions(q, states, 0.0, use_safety, rng)
+        _, known = q.lookup(states)
+        unknown = ~known
+        if unknown.any():
+            actions[unknown] = rng.integers(0, 4, size=int(unknown.sum()))
+
+        _, dones = env.move(actions)
+        for k in np.flatnonzero(dones & (quota > 0)):
+            quota[k] -= 1
+            yield int(env.final_lengths[k]), int(env.final_steps[k])
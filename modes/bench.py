@@ -0,0 +1,290 @@
+"""Fixed-seed benchmarks for the environment, the agent and the game modes."""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from Board.config import EnvConfig
+from Board.environment import Environment
+from agent.dense import DenseQTable, choose_action_dense, update_q_dense
+from agent.encoding import NUM_STATES
+
+ACTIONS = [Environment.UP, Environment.RIGHT, Environment.DOWN, Environment.LEFT]
+
+DEFAULT_SIZES = [(10, 10), (20, 20), (40, 40)]
+BENCH_SEED = 1234
+
+# Baisse maximale toleree au titre du bruit mesure (voir compare)
+MAX_NOISE_ALLOWANCE = 0.2
+
+# name -> {"value": float, "unit": str, "spread": float, "relative": float}
+Results = Dict[str, Dict[str, object]]
+
+
+def _sample_rate(fn: Callable[[], int], min_time: float) -> float:
+    """Items/sec of fn (which returns its item count), run as many times as
+    needed to last at least min_time seconds."""
+    count = 0
+    elapsed = 0.0
+    while elapsed < min_time:
+        start = time.perf_counter()
+        count += fn()
+        elapsed += time.perf_counter() - start
+    return count / elapsed
+
+
+def calibration_loop(n: int = 100000) -> int:
+    """Fixed pure-Python workload: its speed tracks the speed of the machine
+    at the time of the measurement, not of the code under test."""
+    cells = bytearray(1024)
+    for i in range(n):
+        j = (i * 7) & 1023
+        cells[j] = (cells[j] + i) & 255
+    return n
+
+
+def _rate(fn: Callable[[], int], repeats: int,
+          min_time: float) -> Tuple[float, float, float]:
+    """
+    Median items/sec over `repeats` samples of at least min_time seconds,
+    relative spread of the samples, and their median speed relative to the
+    machine.
+
+    calibration_loop runs before the first sample and after every sample;
+    each sample is divided by the mean calibration speed around it, so a
+    load change between two samples cancels out. The spread is the
+    interquartile range / median of these normalized samples (one outlier
+    does not widen it).
+    """
+    samples = []
+    normalized = []
+    before = _sample_rate(calibration_loop, min_time / 4)
+    for _ in range(repeats):
+        sample = _sample_rate(fn, min_time)
+        after = _sample_rate(calibration_loop, min_time / 4)
+        samples.append(sample)
+        normalized.append(sample / ((before + after) / 2))
+        before = after
+    relative = float(np.median(normalized))
+    q1, q3 = np.percentile(normalized, [25, 75])
+    return float(np.median(samples)), float(q3 - q1) / relative, relative
+
+
+###########################################
+########## MICRO ##########################
+###########################################
+
+def bench_move(config: EnvConfig, steps: int = 20000) -> int:
+    """Random-policy moves, resetting on game over."""
+    rng = random.Random(BENCH_SEED)
+    actions = [rng.randrange(4) for _ in range(steps)]
+    env = Environment(config, rng=rng)
+    for action in actions:
+        _, done = env.move(ACTIONS[action])
+        if done:
+            env = Environment(config, rng=rng)
+    return steps
+
+
+def _random_positions(config: EnvConfig, count: int) -> List[Environment]:
+    rng = random.Random(BENCH_SEED)
+    envs = []
+    while len(envs) < count:
+        env = Environment(config, rng=rng)
+        for _ in range(rng.randrange(20)):
+            _, done = env.move(ACTIONS[rng.randrange(4)])
+            if done:
+                break
+        if not env.game_over:
+            envs.append(env)
+    return envs
+
+
+def bench_vision(envs: List[Environment]) -> int:
+    """One get_state() per distinct position, vision cache cleared."""
+    for env in envs:
+        env._state = None
+        env.get_state()
+    return len(envs)
+
+
+def _random_transitions(count: int) -> List[Tuple[int, int, float, int]]:
+    rng = random.Random(BENCH_SEED)
+    return [
+        (rng.randrange(NUM_STATES), rng.randrange(4), rng.uniform(-1.0, 1.0),
+         rng.randrange(NUM_STATES))
+        for _ in range(count)
+    ]
+
+
+def bench_update_q(q: DenseQTable, transitions) -> int:
+    for state, action, reward, next_state in transitions:
+        update_q_dense(q, state, action, reward, next_state, 0.2, 0.95)
+    return len(transitions)
+
+
+def bench_choose_action(q: DenseQTable, states: List[int]) -> int:
+    rng = random.Random(BENCH_SEED)
+    for state in states:
+        choose_action_dense(q, state, 0.0, True, rng=rng)
+    return len(states)
+
+
+###########################################
+########## MACRO ##########################
+###########################################
+
+def bench_train(config: EnvConfig, episodes: int, save_path: str,
+                metrics_path: Optional[str] = None) -> int:
+    from modes.game_modes import train_mode
+    with contextlib.redirect_stdout(io.StringIO()):
+        train_mode(episodes, save_path, config=config, metrics_path=metrics_path,
+                   seed=BENCH_SEED)
+    return episodes
+
+
+def bench_evaluate(config: EnvConfig, games: int, model_path: str) -> int:
+    from modes.game_modes import evaluate_mode
+    with contextlib.redirect_stdout(io.StringIO()):
+        evaluate_mode(games, model_path, config=config, seed=BENCH_SEED)
+    return games
+
+
+###########################################
+########## SUITE ##########################
+###########################################
+
+def run_benchmarks(sizes: List[Tuple[int, int]] = DEFAULT_SIZES,
+                   repeats: int = 5, min_time: float = 1.0,
+                   train_episodes: int = 1000, eval_games: int = 500) -> Results:
+    """
+    Run the micro and macro benchmarks.
+    Returns {name: {value, unit, spread, relative}}: each value is the
+    median of `repeats` samples of at least min_time seconds (a single short
+    run is too noisy to compare against a baseline), relative the same
+    speed divided by the calibration_loop speed measured around each
+    sample (see compare).
+    """
+    results: Results = {}
+
+    def record(name: str, rate: Tuple[float, float, float], unit: str) -> None:
+        value, spread, relative = rate
+        results[name] = {"value": value, "unit": unit, "spread": spread,
+                         "relative": relative}
+        print(f"  {name:<28} {value:>14,.0f} {unit:<11} +/-{50*spread:4.1f}%")
+
+    def measure(fn: Callable[[], int]) -> Tuple[float, float, float]:
+        return _rate(fn, repeats, min_time)
+
+    q = DenseQTable()
+    transitions = _random_transitions(100000)
+    record("micro.update_q", measure(lambda: bench_update_q(q, transitions)),
+           "updates/s")
+    states = [t[0] for t in transitions]
+    record("micro.choose_action", measure(lambda: bench_choose_action(q, states)),
+           "actions/s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for width, height in sizes:
+            config = EnvConfig(width=width, height=height)
+            size = f"{width}x{height}"
+
+            record(f"micro.move.{size}", measure(lambda: bench_move(config)),
+                   "steps/s")
+            positions = _random_positions(config, 2000)
+            record(f"micro.vision.{size}", measure(lambda: bench_vision(positions)),
+                   "states/s")
+
+            model = os.path.join(tmp, f"bench_{size}.l2s")
+            record(f"macro.train.{size}",
+                   measure(lambda: bench_train(config, train_episodes, model)),
+                   "episodes/s")
+            # surcout de --metrics, a comparer avec macro.train
+            metrics = os.path.join(tmp, f"bench_{size}.jsonl")
+            record(f"macro.train_metrics.{size}",
+                   measure(lambda: bench_train(config, train_episodes, model, metrics)),
+                   "episodes/s")
+            record(f"macro.evaluate.{size}",
+                   measure(lambda: bench_evaluate(config, eval_games, model)),
+                   "games/s")
+    return results
+
+
+def compare(results: Results, baseline: Results,
+            tolerance: float) -> List[str]:
+    """
+    Names of the benchmarks slower than baseline by more than `tolerance`.
+    Ratios compare the speeds relative to calibration_loop when both runs
+    have them, so a machine that is slower as a whole does not make every
+    benchmark regress (column machine: raw ratio / corrected ratio). A drop
+    within the spread of the samples is not flagged, up to
+    MAX_NOISE_ALLOWANCE: a noisy benchmark still flags a large regression.
+    """
+    regressions = []
+    print(f"\n  {'benchmark':<28} {'baseline':>12} {'actuel':>12} {'ratio':>7} {'machine':>8}")
+    for name, entry in results.items():
+        if name not in baseline:
+            continue
+        ref = baseline[name]
+        raw = entry["value"] / ref["value"] if ref["value"] else float("inf")
+        ratio = raw
+        if ref.get("relative") and entry.get("relative"):
+            ratio = entry["relative"] / ref["relative"]
+        machine = raw / ratio if ratio else 1.0
+        noise = (entry.get("spread", 0.0) + ref.get("spread", 0.0)) / 2
+        flag = ""
+        if ratio < 1.0 - max(tolerance, min(noise, MAX_NOISE_ALLOWANCE)):
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"  {name:<28} {ref['value']:>12,.0f} {entry['value']:>12,.0f} "
+              f"{ratio:>7.2f} {machine:>8.2f}{flag}")
+    return regressions
+
+
+def bench_mode(output: str, baseline_path: Optional[str] = None,
+               tolerance: float = 0.15,
+               sizes: List[Tuple[int, int]] = DEFAULT_SIZES) -> bool:
+    """Run the suite, write JSON results and compare with a baseline.
+    Returns False if a benchmark regressed beyond the tolerance."""
+    print(f"\n{'='*60}")
+    print(f"  MODE BENCHMARK (seed {BENCH_SEED})")
+    print(f"{'='*60}")
+
+    results = run_benchmarks(sizes)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    folder = os.path.dirname(output)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n  Resultats: {output}")
+
+    ok = True
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, tolerance)
+        ok = not regressions
+        if regressions:
+            print(f"\n  {len(regressions)} regression(s) > {tolerance:.0%}")
+        else:
+            print(f"\n  Aucune regression (tolerance {tolerance:.0%})")
+    print(f"{'='*60}\n")
+    return ok
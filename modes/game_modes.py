@@ -1,22 +1,127 @@
 """Game modes for Learn2Slither."""
 
+import os
+import signal
 import time
 import random
-from typing import Optional
-
-from Board.environment import Environment
-from render.display import PygameRenderer
-from render.ascii import display_grid_ascii, get_key, KEY_UP, KEY_DOWN, KEY_LEFT, KEY_RIGHT
-from agent.agent import QTable, init_state, choose_action, update_q
-from utils.io import save_model, load_model
+from typing import Optional, Tuple
+
+from Board.config import EnvConfig, DEFAULT_CONFIG
+from Board.environment import Environment, make_rngs
+from agent.dense import (
+    DenseQTable,
+    init_state_dense,
+    choose_action_dense,
+    update_q_dense,
+)
+from agent.encoding import encode_state, TERMINAL_STATE_INDEX
+from utils.io import save_model, load_model, ModelTable
+from utils.stats import RunningStats, wilson_interval, z_value
 
 # Constants
 ACTIONS = [Environment.UP, Environment.RIGHT, Environment.DOWN, Environment.LEFT]
 ACTION_NAMES = ["UP", "RIGHT", "DOWN", "LEFT"]
 
-TERMINAL_STATE = (("T", 0), ("T", 0), ("T", 0), ("T", 0))
 
 
+def epsilon_for_episode(ep: int, episodes: int, eps_start: float,
+                        eps_end: float) -> float:
+    """Linear epsilon decay over the first 70% of the episodes."""
+    decay_episodes = int(episodes * 0.7)
+    return max(
+        eps_end,
+        eps_start - (eps_start - eps_end) * ((ep - 1) / max(1, decay_episodes))
+    )
+
+
+def run_training_episode(env: Environment, Q: DenseQTable, epsilon: float,
+                         alpha: float, gamma: float, replay=None,
+                         rng=random) -> Tuple[int, float]:
+    """Play one episode with Q-learning updates. Returns (steps, return).
+    replay: ReplaySchedule (agent.replay), qui stocke chaque transition et
+    rejoue ses minibatchs entre les steps.
+    rng: generateur de l'agent (exploration, egalites), distinct de env.rng."""
+    steps = 0
+    episode_return = 0.0
+
+    # step() renvoie la vision d'apres le move, qui sert d'etat courant au
+    # step suivant: chaque vision est calculee et encodee une seule fois
+    state = encode_state(env.get_state())
+    init_state_dense(Q, state)
+    seen = Q.seen_flat
+
+    while not env.game_over:
+        action = choose_action_dense(Q, state, epsilon, use_safety=False, rng=rng)
+        vision, reward, done = env.step(action)
+        episode_return += reward
+
+        next_state = TERMINAL_STATE_INDEX if done else encode_state(vision)
+        # init_state_dense, en ligne
+        seen[next_state] = True
+        update_q_dense(Q, state, action, reward, next_state, alpha, gamma, done=done)
+        if replay is not None:
+            replay.add(Q, state, action, reward, next_state, done)
+
+        if done:
+            break
+
+        state = next_state
+        steps += 1
+
+    return steps, episode_return
+
+
+def training_metadata(alpha: float, gamma: float, eps_start: float,
+                      eps_end: float, config: EnvConfig) -> dict:
+    """Hyperparameters stored in the model header."""
+    return {
+        "alpha": alpha,
+        "gamma": gamma,
+        "eps_start": eps_start,
+        "eps_end": eps_end,
+        "board": [config.width, config.height],
+    }
+
+
+def new_seed() -> int:
+    """Seed for a run started without --seed (printed so it can be replayed)."""
+    return random.SystemRandom().randrange(2 ** 31)
+
+
+def _rng_state(rng: random.Random) -> list:
+    """State of a random.Random, JSON-serializable."""
+    version, internal, gauss = rng.getstate()
+    return [version, list(internal), gauss]
+
+
+def _restore_rng_state(rng: random.Random, state: list) -> None:
+    version, internal, gauss = state
+    rng.setstate((version, tuple(internal), gauss))
+
+
+def _resume_training(save_path: str, resume_from: str):
+    """
+    Etat a reprendre: le checkpoint de save_path s'il existe, sinon le
+    modele resume_from. Retourne (Q, episodes_done, metadata).
+    """
+    from utils.checkpoint import checkpoint_path, checkpoint_exists, load_checkpoint
+    from utils.io import read_model
+
+    ckpt = checkpoint_path(save_path)
+    if checkpoint_exists(ckpt):
+        Q, meta = load_checkpoint(ckpt)
+        source = ckpt
+    elif not os.path.exists(resume_from):
+        print(f"  Rien a reprendre ({resume_from} absent): depart de zero")
+        return DenseQTable(), 0, {}
+    else:
+        table, meta = read_model(resume_from)
+        Q = table.to_dense()
+        source = resume_from
+
+    print(f"  Reprise depuis {source} (episode {meta.get('episodes', 0)})")
+    return Q, meta.get("episodes", 0), meta
+
 
 def train_mode(
     episodes: int,
@@ -25,66 +130,319 @@ def train_mode(
     gamma: float = 0.95,
     eps_start: float = 0.4,
     eps_end: float = 0.05,
+    config: EnvConfig = DEFAULT_CONFIG,
+    workers: int = 1,
+    sync_every: int = 100,
+    resume_from: Optional[str] = None,
+    checkpoint_every: int = 0,
+    metrics_path: Optional[str] = None,
+    replay_size: int = 0,
+    replay_batch: int = 64,
+    replay_every: int = 8,
+    prioritized: bool = False,
+    seed: Optional[int] = None,
+    eval_every: int = 0,
+    eval_games: int = 100,
+    max_states: int = 0,
 ) -> None:
-    """Train the agent using Q-learning."""
-    Q: QTable = {}
-
-    decay_episodes = int(episodes * 0.7)
-    best_len = 0
+    """Train the agent using Q-learning.
+
+    resume_from: reprend depuis le checkpoint de save_path ou ce modele
+    (Q-table, position du schedule epsilon, etat RNG, meilleure longueur).
+    Le schedule epsilon reste celui du run d'origine (episodes_total du
+    checkpoint ou du modele): --episodes ne fixe plus que l'arret.
+    checkpoint_every: snapshot incremental tous les N episodes, et a
+    l'interruption par Ctrl+C une fois l'episode en cours termine.
+    metrics_path: metriques par episode (JSONL, ou CSV si .csv).
+    replay_size: si > 0, experience replay en plus de l'update en ligne:
+    un minibatch de replay_batch transitions tous les replay_every steps
+    (prioritized: tirage selon l'erreur TD).
+    seed: graine des generateurs environnement / agent (aleatoire si None,
+    affichee): meme seed => meme modele, octet pour octet.
+    eval_every: tous les N episodes, evalue la Q courante sur eval_games
+    parties greedy dans un processus a part (modes.periodic); la meilleure
+    est sauvee dans <save>.best<ext>.
+    max_states: si > 0, nombre maximal d'etats de la Q-table; au-dela, les
+    moins visites sont evinces en fin d'episode (agent.pruning.evict).
+    """
+    if seed is None:
+        seed = new_seed()
+    if workers > 1:
+        from modes.parallel import parallel_train
+        parallel_train(episodes, save_path, workers=workers,
+                       sync_every=sync_every, alpha=alpha, gamma=gamma,
+                       eps_start=eps_start, eps_end=eps_end, config=config,
+                       seed=seed)
+        return
 
     print(f"\n{'='*60}")
     print(f"  MODE ENTRAINEMENT - {episodes} episodes")
     print(f"{'='*60}")
     print(f"  alpha={alpha} | gamma={gamma} | eps {eps_start}->{eps_end}")
+    print(f"  Plateau: {config.width}x{config.height}")
+
+    Q = DenseQTable()
+    done = 0
+    meta = {}
+    if resume_from:
+        Q, done, meta = _resume_training(save_path, resume_from)
+        seed = meta.get("seed", seed)
+    best_len = meta.get("best_len", 0)
+    # le schedule epsilon reprend la ou il en etait, meme si --episodes change
+    schedule_total = meta.get("episodes_total", episodes)
+    if schedule_total != episodes:
+        print(f"  Schedule epsilon conserve: {schedule_total} episodes "
+              f"(--episodes {episodes})")
+    env_rng, agent_rng = make_rngs(seed)
+    rng_state = meta.get("rng_state")
+    if isinstance(rng_state, dict):
+        _restore_rng_state(env_rng, rng_state["env"])
+        _restore_rng_state(agent_rng, rng_state["agent"])
+    print(f"  Seed: {seed}")
     print(f"{'='*60}\n")
 
-    for ep in range(1, episodes + 1):
-        env = Environment()
-        steps = 0
+    if done >= episodes:
+        print(f"Deja {done} episodes entraines (>= {episodes}), rien a faire.")
+        return
+
+    checkpointer = None
+    if checkpoint_every > 0:
+        from utils.checkpoint import Checkpointer, checkpoint_path
+        checkpointer = Checkpointer(checkpoint_path(save_path))
+        if resume_from:
+            checkpointer.resume_from(Q)
+
+    metadata = dict(training_metadata(alpha, gamma, eps_start, eps_end, config),
+                    seed=seed)
+
+    def rng_states() -> dict:
+        return {"env": _rng_state(env_rng), "agent": _rng_state(agent_rng)}
+
+    def state_metadata(ep: int) -> dict:
+        state = dict(metadata, episodes=ep, episodes_total=schedule_total,
+                     best_len=best_len, rng_state=rng_states())
+        if evaluator and evaluator.best > float("-inf"):
+            state["best_eval"] = evaluator.best
+        return state
+
+    metrics = None
+    if metrics_path:
+        from utils.metrics import MetricsSink, TRAIN_FIELDS, TRAIN_INTEGERS
+        # en reprise, les episodes suivants completent le fichier existant,
+        # tronque au checkpoint (les episodes d'apres sont rejoues)
+        metrics = MetricsSink(metrics_path, TRAIN_FIELDS, TRAIN_INTEGERS,
+                              append=done > 0, keep_until=done)
+
+    evaluator = None
+    curve = None
+    if eval_every > 0:
+        from modes.periodic import PeriodicEvaluator
+        evaluator = PeriodicEvaluator(save_path, eval_games, seed, config, metadata,
+                                      best=meta.get("best_eval"))
+        print(f"  Evaluation: {eval_games} parties tous les {eval_every} episodes "
+              f"-> {evaluator.best_path}\n")
+        if metrics_path:
+            from utils.metrics import (MetricsSink, EVAL_CURVE_FIELDS,
+                                       EVAL_CURVE_INTEGERS, eval_curve_path)
+            curve = MetricsSink(eval_curve_path(metrics_path), EVAL_CURVE_FIELDS,
+                                EVAL_CURVE_INTEGERS, batch=1, append=done > 0,
+                                keep_until=done)
+
+    def report_evaluations(results) -> None:
+        for r in results:
+            if curve:
+                curve.record(r["episode"], r["games"], r["mean"], r["half_width"],
+                             r["max"], r["rate_10"])
+            print(f"Eval {r['episode']:5d} | mean={r['mean']:5.2f} +/-{r['half_width']:.2f} | "
+                  f">=10={100*r['rate_10']:5.1f}% | max={r['max']:2d}"
+                  f"{' | meilleur' if r['best'] else ''}")
+
+    replay = None
+    if replay_size > 0:
+        from agent.replay import ReplayBuffer, ReplaySchedule
+        replay = ReplaySchedule(ReplayBuffer(replay_size, prioritized=prioritized,
+                                             seed=seed),
+                                replay_batch, replay_every, alpha, gamma)
+        print(f"  Replay: {replay_size} transitions | batch {replay_batch} "
+              f"tous les {replay_every} steps{' | prioritized' if prioritized else ''}\n")
+
+    evicted = 0
+    if max_states > 0:
+        from agent.pruning import evict
+        print(f"  Cap: {max_states} etats (eviction des moins visites)\n")
+
+    # Avec checkpoints, Ctrl+C laisse finir l'episode en cours: le snapshot
+    # de l'interruption correspond alors exactement a `completed` episodes.
+    # Un second Ctrl+C arrete tout de suite (reprise au dernier checkpoint).
+    interrupted = []
+    previous_handler = None
+    if checkpointer:
+        def on_sigint(signum, frame):
+            if interrupted:
+                raise KeyboardInterrupt
+            interrupted.append(signum)
+            print("\nInterruption: fin de l'episode en cours (Ctrl+C pour forcer)")
+        previous_handler = signal.signal(signal.SIGINT, on_sigint)
+
+    completed = done
+    try:
+        for ep in range(done + 1, episodes + 1):
+            env = Environment(config, rng=env_rng, headless=True)
+            epsilon = epsilon_for_episode(ep, schedule_total, eps_start, eps_end)
+            start = time.perf_counter()
+            steps, episode_return = run_training_episode(env, Q, epsilon, alpha,
+                                                         gamma, replay, agent_rng)
+            elapsed = time.perf_counter() - start
 
-        epsilon = max(
-            eps_end,
-            eps_start - (eps_start - eps_end) * ((ep - 1) / max(1, decay_episodes))
-        )
+            final_len = len(env.snake)
+            best_len = max(best_len, final_len)
+            if max_states > 0:
+                evicted += evict(Q, max_states)
 
-        while not env.game_over:
-            state = env.get_state()
-            init_state(Q, state)
+            if metrics:
+                metrics.record(ep, final_len, steps, episode_return, epsilon,
+                               len(Q), steps / elapsed)
 
-            action = choose_action(Q, state, epsilon, use_safety=False)
-            direction = ACTIONS[action]
+            if ep % 100 == 0 or ep == episodes:
+                print(f"Ep {ep:5d}/{episodes} | len={final_len:2d} | best={best_len:2d} | steps={steps:4d} | eps={epsilon:.3f}")
 
-            reward, done = env.move(direction, state=state, action=action)
+            completed = ep
 
-            if done:
-                next_state = TERMINAL_STATE
-            else:
-                next_state = env.get_state()
+            if evaluator:
+                report_evaluations(evaluator.poll())
+                if ep % eval_every == 0:
+                    evaluator.submit(Q, ep)
 
-            init_state(Q, next_state)
-            update_q(Q, state, action, reward, next_state, alpha, gamma, done=done)
+            if checkpointer and ep % checkpoint_every == 0:
+                checkpointer.snapshot(Q, state_metadata(ep))
 
-            if done:
+            if interrupted:
                 break
 
+        if interrupted:
+            checkpointer.snapshot(Q, state_metadata(completed), wait=True)
+            checkpointer.close()
+            print(f"\nInterrompu apres l'episode {completed}: reprendre avec --resume")
+            return
 
-            steps += 1
-            if done:
-                break
+        if evaluator:
+            # la derniere evaluation se termine avant la sauvegarde
+            report_evaluations(evaluator.poll(wait=True))
+    except KeyboardInterrupt:
+        if not checkpointer:
+            raise
+        # arret force: Q contient un episode partiel, on ne le sauve pas
+        checkpointer.close()
+        print(f"\nArret force pendant l'episode {completed + 1}: "
+              f"--resume repart du dernier checkpoint")
+        return
+    finally:
+        if previous_handler is not None:
+            signal.signal(signal.SIGINT, previous_handler)
+        if metrics:
+            metrics.close()
+        if evaluator:
+            evaluator.close()
+        if curve:
+            curve.close()
+
+    if evaluator:
+        if evaluator.skipped:
+            print(f"  {evaluator.skipped} snapshots ignores (evaluation precedente en cours)")
+        if evaluator.best > float("-inf"):
+            print(f"Meilleur snapshot: {evaluator.best_path} (mean={evaluator.best:.2f})")
+
+    if evicted:
+        print(f"Evictions: {evicted} etats (cap {max_states})")
+    save_model(Q, save_path, episodes=episodes,
+               metadata=dict(metadata, best_len=best_len, rng_state=rng_states(),
+                             episodes_total=schedule_total))
+    if metrics:
+        print(f"Metriques: {metrics_path} ({metrics.rows} episodes)")
+
+    if checkpointer:
+        from utils.checkpoint import remove_checkpoint
+        checkpointer.close()
+        remove_checkpoint(checkpointer.path)
+
+
+def game_seed(base_seed: int, game: int) -> int:
+    """Seed of game number `game`, independent of how games are scheduled."""
+    return (base_seed << 32) + game
+
+
+def play_evaluation_game(Q: ModelTable, seed: int, use_safety: bool,
+                         config: EnvConfig = DEFAULT_CONFIG,
+                         recorder=None) -> Tuple[int, int]:
+    """Play one greedy game without learning. Returns (length, steps).
+    recorder: GameRecorder (utils.recording) qui enregistre la partie."""
+    env_rng, rng = make_rngs(seed)
+    env = Environment(config, rng=env_rng, headless=True)
+    if recorder is not None:
+        recorder.attach(env)
+    steps = 0
+    state = encode_state(env.get_state())
 
-        final_len = len(env.snake)
-        best_len = max(best_len, final_len)
+    while not env.game_over:
+        # IMPORTANT : ne pas modifier Q en evaluation
+        if state not in Q:
+            # action fallback: random (ou safe random si tu veux)
+            action = rng.randint(0, 3)
+        else:
+            action = choose_action_dense(Q, state, 0.0, use_safety=use_safety,
+                                         rng=rng)
+
+        if recorder is not None:
+            recorder.actions.append(action)
 
-        if ep % 100 == 0 or ep == episodes:
-            print(f"Ep {ep:5d}/{episodes} | len={final_len:2d} | best={best_len:2d} | steps={steps:4d} | eps={epsilon:.3f}")
+        vision, _, done = env.step(action)
+        steps += 1
+        if done:
+            break
+        state = encode_state(vision)
 
-    save_model(Q, save_path, episodes=episodes)
+    return len(env.snake), steps
 
 
-def evaluate_mode(num_games: int, model_path: str, use_safety: bool = True) -> None:
-    """Evaluate the trained model without learning."""
+def record_games(Q: ModelTable, games: dict, use_safety: bool,
+                 config: EnvConfig, folder: str, model_path: str) -> None:
+    """
+    Rejoue les parties {nom: (numero, seed)} avec un GameRecorder et les
+    ecrit dans folder/<nom>.l2sr. Les parties etant seedees, l'evaluation
+    elle-meme n'enregistre rien: seules les parties choisies sont rejouees.
+    """
+    from utils.recording import GameRecorder
+    for name, (game, seed) in games.items():
+        recorder = GameRecorder(seed)
+        length, steps = play_evaluation_game(Q, seed, use_safety, config,
+                                             recorder=recorder)
+        path = os.path.join(folder, f"{name}.l2sr")
+        recorder.save(path, {"model": model_path, "game": game,
+                             "length": length, "steps": steps,
+                             "use_safety": use_safety})
+        print(f"  Partie {game} ({name}, longueur {length}): {path}")
+
+
+def evaluate_mode(num_games: int, model_path: str, use_safety: bool = True,
+                  config: EnvConfig = DEFAULT_CONFIG, workers: int = 1,
+                  seed: Optional[int] = None,
+                  metrics_path: Optional[str] = None,
+                  batch_envs: int = 0,
+                  record_dir: Optional[str] = None) -> dict:
+    """Evaluate the trained model without learning.
+    Returns the summary: games, mean, min, max, rate_5, rate_10.
+
+    metrics_path: longueur et steps de chaque partie (JSONL, ou CSV si .csv).
+    batch_envs: si > 1, joue les parties sur autant de boards vectorises
+    (BatchEnvironment + politique batch); les seeds par partie ne
+    s'appliquent pas dans ce cas.
+    record_dir: enregistre la meilleure et la pire partie (replay avec --replay).
+    """
     Q, total_episodes = load_model(model_path)
 
+    if seed is None:
+        seed = new_seed()
+
     epsilon = 0.0
     lengths = []
 
@@ -97,50 +455,84 @@ def evaluate_mode(num_games: int, model_path: str, use_safety: bool = True) -> N
     print(f"  Epsilon: {epsilon} (exploitation pure)")
     print(f"  Apprentissage: DESACTIVE")
     print(f"  Safety filter: {'ON' if use_safety else 'OFF'}")
+    print(f"  Plateau: {config.width}x{config.height}")
+    if batch_envs > 1:
+        print(f"  Seed: {seed} | Boards vectorises: {batch_envs}")
+    else:
+        print(f"  Seed: {seed} | Workers: {workers}")
     print(f"{'='*60}\n")
 
-    for game in range(1, num_games + 1):
-        env = Environment()
-        steps = 0
-
-        while not env.game_over:
-            state = env.get_state()
-
-            # IMPORTANT : ne pas modifier Q en evaluation
-            if state not in Q:
-                # action fallback: random (ou safe random si tu veux)
-                action = random.randint(0, 3)
-            else:
-                action = choose_action(Q, state, epsilon, use_safety=use_safety)
-
-            direction = ACTIONS[action]
-            _, done = env.move(direction, state=state, action=action)
-            steps += 1
-            if done:
-                break
-
-        final_length = len(env.snake)
+    seeds = [game_seed(seed, game) for game in range(1, num_games + 1)]
+    if batch_envs > 1:
+        from modes.batched import batch_evaluate
+        results = batch_evaluate(Q, num_games, use_safety, config, batch_envs,
+                                 seed=seed)
+    elif workers > 1:
+        from modes.parallel import parallel_evaluate
+        results = parallel_evaluate(Q, seeds, use_safety, config, workers)
+    else:
+        results = (play_evaluation_game(Q, s, use_safety, config) for s in seeds)
+
+    metrics = None
+    if metrics_path:
+        from utils.metrics import MetricsSink, EVAL_FIELDS
+        metrics = MetricsSink(metrics_path, EVAL_FIELDS, EVAL_FIELDS)
+
+    for game, (final_length, steps) in enumerate(results, start=1):
         lengths.append(final_length)
+        if metrics:
+            metrics.record(game, final_length, steps)
 
         if game % 10 == 0 or game == num_games:
             print(f"Game {game:4d}/{num_games} | length={final_length:2d} | steps={steps:4d}")
 
+    if metrics:
+        metrics.close()
+        print(f"Metriques: {metrics_path} ({metrics.rows} parties)")
+
     avg_length = sum(lengths) / len(lengths)
     max_length = max(lengths)
     min_length = min(lengths)
     count_10_plus = sum(1 for l in lengths if l >= 10)
     count_5_plus = sum(1 for l in lengths if l >= 5)
 
+    summary = RunningStats()
+    for length in lengths:
+        summary.add(length)
+    z = z_value(0.95)
+    half = summary.half_width(z)
+    rate_10_low, rate_10_high = wilson_interval(count_10_plus, num_games, z)
+
+    if record_dir and batch_envs <= 1:
+        best = max(range(num_games), key=lambda g: lengths[g])
+        worst = min(range(num_games), key=lambda g: lengths[g])
+        print("\nEnregistrements:")
+        record_games(Q, {"best": (best + 1, seeds[best]),
+                         "worst": (worst + 1, seeds[worst])},
+                     use_safety, config, record_dir, model_path)
+
     print(f"\n{'='*60}")
     print(f"  RESULTATS EVALUATION")
     print(f"{'='*60}")
-    print(f"  Longueur moyenne: {avg_length:.2f}")
+    print(f"  Longueur moyenne: {avg_length:.2f} (IC 95%: {avg_length - half:.2f} - {avg_length + half:.2f})")
     print(f"  Longueur max: {max_length}")
     print(f"  Longueur min: {min_length}")
     print(f"  Parties >=5: {count_5_plus}/{num_games} ({100*count_5_plus/num_games:.1f}%)")
-    print(f"  Parties >=10: {count_10_plus}/{num_games} ({100*count_10_plus/num_games:.1f}%)")
+    print(f"  Parties >=10: {count_10_plus}/{num_games} ({100*count_10_plus/num_games:.1f}%, "
+          f"IC 95%: {100*rate_10_low:.1f}% - {100*rate_10_high:.1f}%)")
     print(f"{'='*60}\n")
 
+    return {
+        "games": num_games,
+        "mean": avg_length,
+        "min": min_length,
+        "max": max_length,
+        "rate_5": count_5_plus / num_games,
+        "rate_10": count_10_plus / num_games,
+        "mean_ci": [avg_length - half, avg_length + half],
+        "rate_10_ci": [rate_10_low, rate_10_high],
+    }
+
 
 def print_vision(env, action_taken: int) -> None:
     """
@@ -164,15 +556,24 @@ def print_vision(env, action_taken: int) -> None:
 
 
 def visual_mode(model_path: str, use_window: bool, fps: int,
-                step_by_step: bool = False) -> None:
-    """Visualize the trained agent playing."""
+                step_by_step: bool = False,
+                config: EnvConfig = DEFAULT_CONFIG,
+                seed: Optional[int] = None) -> None:
+    """Visualize the trained agent playing (seed: partie reproductible)."""
+    # Imports locaux: pygame et termios ne sont charges que pour ce mode
+    from render.ascii import display_grid_ascii
     Q, total_episodes = load_model(model_path)
 
-    renderer: Optional[PygameRenderer] = None
+    renderer = None
     if use_window:
-        renderer = PygameRenderer(width=10, height=10, cell_size=50)
-
-    env = Environment()
+        from render.display import PygameRenderer
+        renderer = PygameRenderer(width=config.width, height=config.height,
+                                  cell_size=50)
+
+    if seed is None:
+        seed = new_seed()
+    env_rng, agent_rng = make_rngs(seed)
+    env = Environment(config, rng=env_rng)
     epsilon = 0.0
     steps = 0
 
@@ -186,6 +587,7 @@ def visual_mode(model_path: str, use_window: bool, fps: int,
     if use_window:
         print(f"  FPS: {fps}")
     print(f"  Step-by-step: {'ON' if step_by_step else 'OFF'}")
+    print(f"  Seed: {seed}")
     if step_by_step:
         print("  (Appuyez sur ENTREE pour avancer)")
     print()
@@ -201,10 +603,11 @@ def visual_mode(model_path: str, use_window: bool, fps: int,
             else:
                 display_grid_ascii(env)
 
-            state = env.get_state()
-            init_state(Q, state)
+            vision = env.get_state()
+            state = encode_state(vision)
 
-            action = choose_action(Q, state, epsilon, use_safety=True)
+            action = choose_action_dense(Q, state, epsilon, use_safety=True,
+                                         rng=agent_rng)
             direction = ACTIONS[action]
 
             # Affichage vision + action dans le terminal (conforme au sujet)
@@ -214,16 +617,15 @@ def visual_mode(model_path: str, use_window: bool, fps: int,
             if step_by_step:
                 input("  Appuyez sur ENTREE pour continuer...")
 
-            _, done = env.move(direction, state=state, action=action)
+            _, done = env.move(direction, state=vision, action=action)
             steps += 1
 
             if renderer:
                 renderer.draw(env.grid, length=len(env.snake), steps=steps, episode=1)
                 if not step_by_step:
                     renderer.tick(fps)
-            else:
-                if not step_by_step:
-                    time.sleep(0.15)
+            elif not step_by_step and fps > 0:
+                time.sleep(1.0 / fps)
 
             if done:
                 break
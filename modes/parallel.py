@@ -0,0 +1,237 @@
+"""Multiprocess training and evaluation for Learn2Slither."""
+
+import multiprocessing as mp
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from Board.config import EnvConfig, DEFAULT_CONFIG
+from Board.environment import Environment, make_rngs
+from agent.dense import DenseQTable
+from modes.game_modes import (
+    epsilon_for_episode,
+    run_training_episode,
+    play_evaluation_game,
+    training_metadata,
+    game_seed,
+)
+from utils.io import save_model, ModelTable
+
+
+# Lignes modifiees: (indices des states, deltas [n, 4], seen [n], visites [n])
+QDelta = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def _q_delta(q: DenseQTable, base: DenseQTable) -> QDelta:
+    """Rows changed since the last synced copy: (states, deltas, seen, new visits)."""
+    delta = q.values - base.values
+    visits = q.visits - base.visits
+    rows = np.flatnonzero(delta.any(axis=1) | (q.seen & ~base.seen) | (visits > 0))
+    return rows, delta[rows], q.seen[rows], visits[rows]
+
+
+def _train_worker(conn, worker_id: int, workers: int, local_episodes: int,
+                  episodes: int, sync_every: int, alpha: float, gamma: float,
+                  eps_start: float, eps_end: float, config: EnvConfig,
+                  seed: int) -> None:
+    """
+    Boucle d'un worker: joue `sync_every` episodes sur sa Q locale, envoie
+    le delta au master, puis recoit les lignes fusionnees.
+    Message envoye: (delta, lengths, finished)
+    """
+    # Generateurs propres au worker, derives de la seed du run
+    env_rng, agent_rng = make_rngs(game_seed(seed, worker_id + 1))
+
+    q = DenseQTable()
+    base = DenseQTable()
+    done = 0
+
+    while done < local_episodes:
+        lengths = []
+        for _ in range(min(sync_every, local_episodes - done)):
+            # Episodes entrelaces: le schedule epsilon suit la progression globale
+            ep = done * workers + worker_id + 1
+            epsilon = epsilon_for_episode(ep, episodes, eps_start, eps_end)
+            env = Environment(config, rng=env_rng, headless=True)
+            run_training_episode(env, q, epsilon, alpha, gamma, rng=agent_rng)
+            lengths.append(len(env.snake))
+            done += 1
+
+        finished = done >= local_episodes
+        conn.send((_q_delta(q, base), lengths, finished))
+        base.visits[:] = q.visits
+        if finished:
+            break
+
+        rows, values, seen = conn.recv()
+        q.values[rows] = values
+        q.seen[rows] |= seen
+        q.invalidate(rows)
+        base.values[rows] = values
+        base.seen[rows] = q.seen[rows]
+
+    conn.close()
+
+
+def _merge_deltas(q: DenseQTable, deltas: List[QDelta]) -> QDelta:
+    """
+    Applique la moyenne des deltas par (state, action) sur la Q master,
+    en ne comptant que les workers qui ont modifie cette valeur.
+    Retourne les lignes modifiees (states, values, seen).
+    """
+    sums = np.zeros_like(q.values)
+    counts = np.zeros(q.values.shape, dtype=np.int32)
+    for rows, delta, seen, visits in deltas:
+        sums[rows] += delta
+        counts[rows] += delta != 0.0
+        q.seen[rows] |= seen
+        # les visites de tous les workers s'additionnent
+        q.visits[rows] += visits
+
+    touched = counts > 0
+    q.values[touched] += sums[touched] / counts[touched]
+    rows = np.unique(np.concatenate([d[0] for d in deltas]))
+    q.invalidate(rows)
+    return rows, q.values[rows], q.seen[rows]
+
+
+def parallel_train(
+    episodes: int,
+    save_path: str,
+    workers: int,
+    sync_every: int = 100,
+    alpha: float = 0.2,
+    gamma: float = 0.95,
+    eps_start: float = 0.4,
+    eps_end: float = 0.05,
+    config: EnvConfig = DEFAULT_CONFIG,
+    seed: int = 0,
+) -> None:
+    """Train with `workers` processes merged into a master Q every `sync_every` episodes.
+    Worker k draws from generators derived from (seed, k): same seed, same model."""
+    Q = DenseQTable()
+    best_len = 0
+    played = 0
+
+    print(f"\n{'='*60}")
+    print(f"  MODE ENTRAINEMENT PARALLELE - {episodes} episodes")
+    print(f"{'='*60}")
+    print(f"  alpha={alpha} | gamma={gamma} | eps {eps_start}->{eps_end}")
+    print(f"  Plateau: {config.width}x{config.height}")
+    print(f"  Workers: {workers} | sync tous les {sync_every} episodes")
+    print(f"  Seed: {seed}")
+    print(f"{'='*60}\n")
+
+    conns = []
+    procs = []
+    worker_ids = {}
+    for worker_id in range(workers):
+        local_episodes = episodes // workers + (1 if worker_id < episodes % workers else 0)
+        if local_episodes == 0:
+            continue
+        parent, child = mp.Pipe()
+        proc = mp.Process(
+            target=_train_worker,
+            args=(child, worker_id, workers, local_episodes, episodes,
+                  sync_every, alpha, gamma, eps_start, eps_end, config, seed),
+            daemon=True,
+        )
+        proc.start()
+        child.close()
+        conns.append(parent)
+        procs.append(proc)
+        worker_ids[parent] = (worker_id, proc)
+
+    def worker_failed(conn) -> RuntimeError:
+        worker_id, proc = worker_ids[conn]
+        proc.join(timeout=1.0)
+        return RuntimeError(f"Le worker {worker_id} s'est arrete sans resultat "
+                            f"(code de sortie {proc.exitcode})")
+
+    completed = False
+    try:
+        sync = 0
+        while conns:
+            deltas = []
+            lengths = []
+            running = []
+            for conn in conns:
+                try:
+                    delta, worker_lengths, finished = conn.recv()
+                except EOFError:
+                    raise worker_failed(conn) from None
+                deltas.append(delta)
+                lengths.extend(worker_lengths)
+                if not finished:
+                    running.append(conn)
+
+            changed = _merge_deltas(Q, deltas)
+            for conn in running:
+                try:
+                    conn.send(changed)
+                except (BrokenPipeError, ConnectionResetError):
+                    raise worker_failed(conn) from None
+            conns = running
+
+            sync += 1
+            played += len(lengths)
+            best_len = max(best_len, max(lengths))
+            mean_len = sum(lengths) / len(lengths)
+            epsilon = epsilon_for_episode(played, episodes, eps_start, eps_end)
+            print(f"Sync {sync:4d} | ep {played:6d}/{episodes} | mean len={mean_len:5.2f} | best={best_len:2d} | etats={len(Q):5d} | eps={epsilon:.3f}")
+        completed = True
+    finally:
+        # sur erreur, les workers restants attendent la Q fusionnee dans
+        # conn.recv(): fermer les pipes et les terminer avant join()
+        for conn in worker_ids:
+            conn.close()
+        for proc in procs:
+            if not completed and proc.is_alive():
+                proc.terminate()
+            proc.join()
+
+    save_model(Q, save_path, episodes=episodes,
+               metadata=dict(training_metadata(alpha, gamma, eps_start, eps_end, config),
+                             seed=seed))
+
+
+###########################################
+########## EVALUATION #####################
+###########################################
+
+# Q-table du pool d'evaluation, heritee en copy-on-write avec fork
+_EVAL_Q: Optional[ModelTable] = None
+
+
+def _init_eval_worker(q: ModelTable) -> None:
+    global _EVAL_Q
+    _EVAL_Q = q
+
+
+def _eval_game(args: Tuple[int, bool, EnvConfig]) -> Tuple[int, int]:
+    seed, use_safety, config = args
+    return play_evaluation_game(_EVAL_Q, seed, use_safety, config)
+
+
+def _pool_context():
+    """fork partage la Q-table sans copie tant qu'elle n'est pas modifiee."""
+    if "fork" in mp.get_all_start_methods():
+        return mp.get_context("fork")
+    return mp.get_context()
+
+
+def parallel_evaluate(q: ModelTable, seeds: List[int], use_safety: bool,
+                      config: EnvConfig, workers: int) -> Iterator[Tuple[int, int]]:
+    """
+    Joue une partie par seed sur un pool de processus.
+    Les resultats sont renvoyes dans l'ordre des seeds: identiques quel que
+    soit le nombre de workers.
+    """
+    chunksize = max(1, len(seeds) // (workers * 8))
+    with _pool_context().Pool(workers, initializer=_init_eval_worker,
+                              initargs=(q,)) as pool:
+        yield from pool.imap(
+            _eval_game,
+            [(seed, use_safety, config) for seed in seeds],
+            chunksize=chunksize,
+        )
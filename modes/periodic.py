@@ -0,0 +1,144 @@
+"""Periodic greedy evaluation during training (--eval-every), off the training loop.
+
+submit() forks a process that inherits the Q-table copy-on-write: the fork
+is the snapshot, and training keeps updating its own pages while the child
+plays its games. Every snapshot is evaluated on the same seeds, so two
+points of the learning curve differ only by the table. One evaluation runs
+at a time; a snapshot taken while the previous one is still running is
+skipped.
+
+A child whose mean beats the best result known when it was forked writes its
+table to a temporary file; the trainer renames it to the best-model path
+(<save>.best<ext>) if it is still the best when the result comes back.
+"""
+
+import os
+import signal
+from typing import Any, Dict, List, Optional
+
+from Board.config import EnvConfig
+from agent.dense import DenseQTable
+from modes.game_modes import game_seed, play_evaluation_game
+from utils.io import write_model
+from utils.stats import RunningStats, wilson_interval, z_value
+
+
+def best_model_path(save_path: str) -> str:
+    root, ext = os.path.splitext(save_path)
+    return f"{root}.best{ext}"
+
+
+def _evaluate_snapshot(conn, q: DenseQTable, episode: int, games: int, seed: int,
+                       use_safety: bool, config: EnvConfig, best: float,
+                       tmp_path: str, metadata: Dict[str, Any]) -> None:
+    # Ctrl+C vise le trainer, qui arrete lui-meme l'evaluation en cours
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    lengths = RunningStats()
+    count_10_plus = 0
+    for game in range(1, games + 1):
+        length, _ = play_evaluation_game(q, game_seed(seed, game), use_safety, config)
+        lengths.add(length)
+        count_10_plus += length >= 10
+
+    z = z_value(0.95)
+    result = {
+        "episode": episode,
+        "games": games,
+        "mean": lengths.mean,
+        "half_width": lengths.half_width(z),
+        "max": int(lengths.max),
+        "rate_10": count_10_plus / games,
+        "rate_10_ci": wilson_interval(count_10_plus, games, z),
+        "saved": False,
+    }
+    if lengths.mean > best:
+        write_model(q, tmp_path, dict(metadata, episodes=episode,
+                                      eval_mean=lengths.mean, eval_games=games))
+        result["saved"] = True
+    conn.send(result)
+    conn.close()
+
+
+class PeriodicEvaluator:
+    """Forks one evaluation process per snapshot, collects results with poll()."""
+
+    def __init__(self, save_path: str, games: int, seed: int, config: EnvConfig,
+                 metadata: Dict[str, Any], use_safety: bool = True,
+                 best: Optional[float] = None):
+        if games < 2:
+            # half_width() d'une seule partie est inf, invalide en JSON
+            raise ValueError("Une evaluation periodique demande au moins 2 parties")
+        from modes.parallel import _pool_context
+        self._ctx = _pool_context()
+        self.best_path = best_model_path(save_path)
+        self.games = games
+        self.seed = seed
+        self.config = config
+        self.metadata = metadata
+        self.use_safety = use_safety
+        self.best = float("-inf") if best is None else best
+        self.skipped = 0
+        self._proc = None
+        self._conn = None
+        self._tmp_path = ""
+
+    @property
+    def busy(self) -> bool:
+        return self._proc is not None
+
+    def submit(self, q: DenseQTable, episode: int) -> bool:
+        """Start evaluating the current table. False if an evaluation is running."""
+        if self.busy:
+            self.skipped += 1
+            return False
+        self._tmp_path = f"{self.best_path}.ep{episode}.tmp"
+        # sans fork (spawn), la table est copiee vers l'enfant
+        parent, child = self._ctx.Pipe(duplex=False)
+        self._proc = self._ctx.Process(
+            target=_evaluate_snapshot,
+            args=(child, q, episode, self.games, self.seed, self.use_safety,
+                  self.config, self.best, self._tmp_path, self.metadata),
+            daemon=True,
+        )
+        self._proc.start()
+        child.close()
+        self._conn = parent
+        return True
+
+    def poll(self, wait: bool = False) -> List[Dict[str, Any]]:
+        """Finished evaluations (0 or 1). Keeps the best snapshot on disk."""
+        if not self.busy or not (wait or self._conn.poll()):
+            return []
+        try:
+            result = self._conn.recv()
+        except EOFError:
+            # enfant mort sans resultat
+            result = None
+        self._proc.join()
+        self._conn.close()
+        self._proc = None
+        self._conn = None
+        if result is None:
+            return []
+
+        result["best"] = False
+        if result["saved"]:
+            if result["mean"] > self.best:
+                self.best = result["mean"]
+                os.replace(self._tmp_path, self.best_path)
+                result["best"] = True
+            else:
+                os.remove(self._tmp_path)
+        return [result]
+
+    def close(self) -> None:
+        """Stop a running evaluation without waiting for it."""
+        if self.busy:
+            self._proc.terminate()
+            self._proc.join()
+            self._conn.close()
+            self._proc = None
+            self._conn = None
+            for path in (self._tmp_path, f"{self._tmp_path}.tmp"):
+                if os.path.exists(path):
+                    os.remove(path)
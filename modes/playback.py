@@ -0,0 +1,88 @@
+"""Replay of recorded games (--replay): ASCII or pygame, any speed, seek."""
+
+import time
+
+from utils.recording import ACTION_DIRECTIONS, Recording, load_recording
+
+
+def _ask_step(step: int, total: int) -> int:
+    """Step-by-step prompt: ENTREE avance, 'b' recule, un nombre saute."""
+    answer = input(f"  Step {step}/{total} - ENTREE: suivant | b: precedent | n: aller au step n > ").strip()
+    if answer == "b":
+        return max(0, step - 1)
+    if answer.isdigit():
+        return min(int(answer), total)
+    return step + 1
+
+
+def replay_mode(path: str, use_window: bool = False, fps: int = 10,
+                step_by_step: bool = False, seek: int = 0) -> None:
+    """
+    Rejoue un enregistrement .l2sr.
+    fps: vitesse d'affichage (0 = aussi vite que possible).
+    seek: premier step affiche (les steps precedents sont rejoues sans rendu).
+    En step-by-step, on peut reculer ou sauter a n'importe quel step: le
+    plateau est reconstruit depuis le debut, ce qui ne coute que quelques ms.
+    """
+    recording: Recording = load_recording(path)
+    header = recording.header
+    total = len(recording)
+
+    print(f"\n{'='*50}")
+    print("  MODE REPLAY")
+    print(f"{'='*50}")
+    print(f"  Fichier: {path}")
+    print(f"  Modele: {header.get('model', '?')} | partie {header.get('game', '?')}")
+    print(f"  Plateau: {recording.config.width}x{recording.config.height} | seed {header['seed']}")
+    print(f"  Longueur finale: {header.get('length', '?')} | steps: {total}")
+    print(f"{'='*50}\n")
+
+    renderer = None
+    if use_window:
+        from render.display import PygameRenderer
+        renderer = PygameRenderer(width=recording.config.width,
+                                  height=recording.config.height, cell_size=50)
+    from render.ascii import display_grid_ascii
+
+    def show(env, step: int) -> None:
+        if renderer:
+            renderer.draw(env.grid, length=len(env.snake), steps=step, episode=1)
+        else:
+            display_grid_ascii(env)
+            print(f"  Step {step}/{total}")
+
+    step = min(max(seek, 0), total)
+    env = recording.env_at(step)
+    try:
+        while True:
+            if renderer and not renderer.handle_quit():
+                break
+            show(env, step)
+            if step >= total or env.game_over:
+                if not step_by_step:
+                    break
+            if step_by_step:
+                target = _ask_step(step, total)
+                if target > total:
+                    break
+                if target == step + 1:
+                    env.move(ACTION_DIRECTIONS[recording.actions[step]])
+                elif target != step:
+                    env = recording.env_at(target)
+                step = target
+                continue
+
+            env.move(ACTION_DIRECTIONS[recording.actions[step]])
+            step += 1
+            if fps > 0:
+                if renderer:
+                    renderer.tick(fps)
+                else:
+                    time.sleep(1.0 / fps)
+
+        print(f"\n  Fin du replay: longueur {len(env.snake)} apres {step} steps\n")
+    except KeyboardInterrupt:
+        print("\n\nReplay interrompu.")
+    finally:
+        if renderer:
+            renderer.close()
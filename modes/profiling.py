@@ -0,0 +1,150 @@
+"""Per-phase step timers and cProfile dumps (--profile / --profile-out).
+
+The game loops are not edited: profile_phases() temporarily replaces the
+Environment methods and the agent functions used by modes.game_modes with
+timed wrappers (perf_counter_ns). Nested phases (move and get_state inside
+step, random_empty_cell and _set_cell inside move) are subtracted from
+their parent's self time. Each
+timed call costs a few hundred ns; the report prints the calibrated total
+so it can be discounted.
+"""
+
+import contextlib
+import cProfile
+import io
+import pstats
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from Board.environment import Environment
+import modes.game_modes as game_modes
+
+# (nom affiche, cible, attribut, parent) dans l'ordre du tableau
+PHASES: List[Tuple[str, object, str, Optional[str]]] = [
+    ("reset", Environment, "__init__", None),
+    ("get_state", Environment, "get_state", None),
+    ("encode_state", game_modes, "encode_state", None),
+    ("choose_action", game_modes, "choose_action_dense", None),
+    ("step", Environment, "step", None),
+    ("move", Environment, "move", "step"),
+    ("random_empty_cell", Environment, "random_empty_cell", "move"),
+    ("_set_cell", Environment, "_set_cell", "move"),
+    ("update_grid", Environment, "update_grid", "move"),
+    ("init_state", game_modes, "init_state_dense", None),
+    ("update_q", game_modes, "update_q_dense", None),
+]
+
+
+class PhaseTimer:
+    """Cumulative time, self time and call count per phase, in ns."""
+
+    def __init__(self):
+        # nom -> [cumul, self, appels]
+        self.totals: Dict[str, List[int]] = {}
+        self._stack: List[int] = []
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        entry = self.totals.setdefault(name, [0, 0, 0])
+        stack = self._stack
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            # pas de try/finally: une exception interrompt de toute facon le run
+            stack.append(0)
+            start = clock()
+            result = fn(*args, **kwargs)
+            elapsed = clock() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            entry[0] += elapsed
+            entry[1] += elapsed - nested
+            entry[2] += 1
+            return result
+
+        return timed
+
+    def overhead_ns(self, samples: int = 100000) -> float:
+        """Cost of one wrapped call beyond the call itself (calibration)."""
+        def noop():
+            return None
+
+        probe = PhaseTimer().wrap("probe", noop)
+        clock = time.perf_counter_ns
+        start = clock()
+        for _ in range(samples):
+            noop()
+        bare = clock() - start
+        start = clock()
+        for _ in range(samples):
+            probe()
+        return max(0.0, (clock() - start - bare) / samples)
+
+    def report(self, wall_ns: int) -> str:
+        """Breakdown table: one line per phase, sub-phases indented."""
+        calls = sum(entry[2] for entry in self.totals.values())
+        overhead = self.overhead_ns() * calls
+        accounted = sum(entry[1] for entry in self.totals.values())
+
+        lines = [
+            f"{'='*72}",
+            f"  PROFIL PAR PHASE ({wall_ns / 1e9:.2f} s)",
+            f"{'='*72}",
+            f"  {'phase':<22} {'appels':>10} {'cumul ms':>10} {'self ms':>10} {'ns/appel':>9} {'%':>6}",
+        ]
+        for name, _, _, parent in PHASES:
+            total, own, count = self.totals.get(name, (0, 0, 0))
+            if count == 0:
+                continue
+            label = f"  {name}" if parent else name
+            lines.append(
+                f"  {label:<22} {count:>10,} {total / 1e6:>10.1f} {own / 1e6:>10.1f} "
+                f"{total / count:>9.0f} {100 * own / wall_ns:>5.1f}%"
+            )
+        rest = wall_ns - accounted
+        lines.append(f"  {'(boucle / autre)':<22} {'':>10} {'':>10} {rest / 1e6:>10.1f} "
+                     f"{'':>9} {100 * rest / wall_ns:>5.1f}%")
+        lines.append(f"  Surcout estime des timers: {overhead / 1e6:.1f} ms "
+                     f"({100 * overhead / wall_ns:.1f}%), reparti dans les phases")
+        lines.append(f"{'='*72}")
+        return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def profile_phases(timer: PhaseTimer):
+    """Install the timed wrappers for the duration of the block."""
+    originals = []
+    for name, target, attr, _ in PHASES:
+        fn = getattr(target, attr)
+        originals.append((target, attr, fn))
+        setattr(target, attr, timer.wrap(name, fn))
+    try:
+        yield timer
+    finally:
+        for target, attr, fn in originals:
+            setattr(target, attr, fn)
+
+
+def profile_call(fn: Callable, *args, cprofile_path: Optional[str] = None,
+                 **kwargs) -> None:
+    """
+    Run fn(*args, **kwargs) and print where the time went.
+    Without cprofile_path: per-phase table (PhaseTimer). With cprofile_path:
+    run under cProfile instead, dump the stats there (pstats / snakeviz)
+    and print the top functions by cumulative time.
+    """
+    if cprofile_path:
+        profiler = cProfile.Profile()
+        profiler.runcall(fn, *args, **kwargs)
+        profiler.dump_stats(cprofile_path)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(20)
+        print(out.getvalue())
+        print(f"Profil cProfile: {cprofile_path}")
+        return
+
+    timer = PhaseTimer()
+    start = time.perf_counter_ns()
+    with profile_phases(timer):
+        fn(*args, **kwargs)
+    print(timer.report(time.perf_counter_ns() - start))
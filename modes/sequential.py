@@ -0,0 +1,174 @@
+"""Sequential evaluation: play games until the estimate is precise enough.
+
+Alone, a model plays until the confidence interval of its mean length is
+narrower than target_ci. Against a baseline (compare), both models play the
+same seeds (paired games) and the statistic is the per-seed difference
+candidate - baseline: evaluation stops as soon as its interval excludes 0
+(clearly better or worse), or is narrower than target_ci (equivalent).
+
+The stopping rule is checked every `check_every` games once min_games are
+played. Since looking repeatedly at the same data inflates the error rate,
+the better/worse decision uses a Bonferroni-corrected quantile over the
+maximum number of checks; the reported intervals use the nominal level.
+"""
+
+from typing import Iterator, Optional, Tuple
+
+from Board.config import EnvConfig, DEFAULT_CONFIG
+from modes.game_modes import game_seed, new_seed, play_evaluation_game
+from utils.io import ModelTable, load_model
+from utils.stats import RunningStats, wilson_interval, z_value
+
+
+def _games(q: ModelTable, seed: int, max_games: int, use_safety: bool,
+           config: EnvConfig, workers: int) -> Iterator[Tuple[int, int]]:
+    """(length, steps) of games 1..max_games, in order; stopping early is free
+    (le pool est termine a la fermeture du generateur)."""
+    seeds = (game_seed(seed, game) for game in range(1, max_games + 1))
+    if workers > 1:
+        from modes.parallel import parallel_evaluate
+        return parallel_evaluate(q, list(seeds), use_safety, config, workers)
+    return (play_evaluation_game(q, s, use_safety, config) for s in seeds)
+
+
+def sequential_evaluate_mode(
+    model_path: str,
+    max_games: int,
+    use_safety: bool = True,
+    config: EnvConfig = DEFAULT_CONFIG,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    target_ci: float = 0.0,
+    baseline_path: Optional[str] = None,
+    min_games: int = 30,
+    confidence: float = 0.95,
+    check_every: int = 10,
+    metrics_path: Optional[str] = None,
+) -> dict:
+    """
+    Evaluate model_path with at most max_games games.
+    target_ci: largeur totale visee de l'intervalle de confiance (longueur
+    moyenne, ou difference moyenne avec baseline_path); 0 = pas de critere
+    de precision.
+    Returns the summary, with the comparison fields when baseline_path is set.
+    """
+    z = z_value(confidence)
+    min_games = max(2, min(min_games, max_games))
+    checks = 1 + (max_games - min_games) // check_every
+    z_stop = z_value(1 - (1 - confidence) / checks)
+
+    Q, total_episodes = load_model(model_path)
+    baseline = load_model(baseline_path)[0] if baseline_path else None
+    if seed is None:
+        seed = new_seed()
+
+    print(f"\n{'='*60}")
+    print(f"  MODE EVALUATION SEQUENTIELLE - {max_games} parties max")
+    print(f"{'='*60}")
+    print(f"  Model: {model_path} ({total_episodes} episodes, {len(Q)} etats)")
+    if baseline is not None:
+        print(f"  Baseline: {baseline_path} ({len(baseline)} etats), memes seeds")
+    print(f"  Arret: IC {100*confidence:.0f}% de largeur <= {target_ci or '-'}"
+          f"{' ou difference significative' if baseline is not None else ''}")
+    print(f"  Verification tous les {check_every} parties a partir de {min_games}")
+    print(f"  Safety filter: {'ON' if use_safety else 'OFF'}")
+    print(f"  Plateau: {config.width}x{config.height}")
+    print(f"  Seed: {seed} | Workers: {workers}")
+    print(f"{'='*60}\n")
+
+    lengths = RunningStats()
+    count_5_plus = 0
+    count_10_plus = 0
+    diffs = RunningStats()
+    base_lengths = RunningStats()
+    decision = "max atteint"
+
+    results = _games(Q, seed, max_games, use_safety, config, workers)
+    base_results = None
+    if baseline is not None:
+        base_results = _games(baseline, seed, max_games, use_safety, config, workers)
+
+    metrics = None
+    if metrics_path:
+        from utils.metrics import MetricsSink, EVAL_FIELDS
+        metrics = MetricsSink(metrics_path, EVAL_FIELDS, EVAL_FIELDS)
+
+    try:
+        for game, (length, steps) in enumerate(results, start=1):
+            lengths.add(length)
+            count_5_plus += length >= 5
+            count_10_plus += length >= 10
+            if metrics:
+                metrics.record(game, length, steps)
+            if base_results is not None:
+                base_length, _ = next(base_results)
+                base_lengths.add(base_length)
+                diffs.add(length - base_length)
+
+            if game < min_games or (game - min_games) % check_every:
+                continue
+
+            tracked = diffs if baseline is not None else lengths
+            half = tracked.half_width(z)
+            line = f"Game {game:4d} | mean={lengths.mean:5.2f} +/-{lengths.half_width(z):.2f}"
+            if baseline is not None:
+                line += f" | diff={diffs.mean:+5.2f} +/-{half:.2f}"
+            print(line)
+
+            if baseline is not None:
+                half_stop = diffs.half_width(z_stop)
+                if diffs.mean - half_stop > 0:
+                    decision = "meilleur"
+                    break
+                if diffs.mean + half_stop < 0:
+                    decision = "moins bon"
+                    break
+            if target_ci > 0 and 2 * half <= target_ci:
+                decision = "equivalent" if baseline is not None else "precision atteinte"
+                break
+    finally:
+        results.close()
+        if base_results is not None:
+            base_results.close()
+        if metrics:
+            metrics.close()
+
+    games = lengths.n
+    half = lengths.half_width(z)
+    rate_10_low, rate_10_high = wilson_interval(count_10_plus, games, z)
+    level = f"{100*confidence:.0f}%"
+
+    print(f"\n{'='*60}")
+    print(f"  RESULTATS EVALUATION ({games} parties, arret: {decision})")
+    print(f"{'='*60}")
+    print(f"  Longueur moyenne: {lengths.mean:.2f} (IC {level}: "
+          f"{lengths.mean - half:.2f} - {lengths.mean + half:.2f}) | ecart-type {lengths.std:.2f}")
+    print(f"  Longueur max: {lengths.max:.0f}")
+    print(f"  Longueur min: {lengths.min:.0f}")
+    print(f"  Parties >=5: {count_5_plus}/{games} ({100*count_5_plus/games:.1f}%)")
+    print(f"  Parties >=10: {count_10_plus}/{games} ({100*count_10_plus/games:.1f}%, "
+          f"IC {level}: {100*rate_10_low:.1f}% - {100*rate_10_high:.1f}%)")
+
+    stats = {
+        "games": games,
+        "mean": lengths.mean,
+        "mean_ci": [lengths.mean - half, lengths.mean + half],
+        "std": lengths.std,
+        "min": int(lengths.min),
+        "max": int(lengths.max),
+        "rate_5": count_5_plus / games,
+        "rate_10": count_10_plus / games,
+        "rate_10_ci": [rate_10_low, rate_10_high],
+        "decision": decision,
+    }
+    if baseline is not None:
+        diff_half = diffs.half_width(z)
+        print(f"  Baseline: {base_lengths.mean:.2f} | difference: {diffs.mean:+.2f} "
+              f"(IC {level}: {diffs.mean - diff_half:+.2f} - {diffs.mean + diff_half:+.2f})")
+        stats.update({
+            "baseline_mean": base_lengths.mean,
+            "diff": diffs.mean,
+            "diff_ci": [diffs.mean - diff_half, diffs.mean + diff_half],
+        })
+    print(f"{'='*60}\n")
+    return stats
@@ -0,0 +1,297 @@
+"""Hyperparameter sweep (--sweep): grid or random search over train+evaluate.
+
+The sweep is described by a JSON file:
+
+    {
+      "method": "random",            # ou "grid"
+      "trials": 24,                  # random: nombre d'essais
+      "episodes": 5000,              # episodes d'entrainement par essai
+      "games": 200,                  # parties d'evaluation par essai
+      "seed": 0,                     # meme seed pour tous les essais
+      "params": {
+        "alpha": [0.1, 0.2, 0.3],
+        "gamma": {"min": 0.9, "max": 0.99},
+        "eps_start": [0.2, 0.4],
+        "rewards.green": {"min": 5, "max": 40, "log": true}
+      }
+    }
+
+Params are alpha, gamma, eps_start, eps_end and rewards.<champ de
+RewardTable>. A grid takes the product of the lists; a random search draws
+from the lists or from the {min, max[, log]} ranges, with an RNG seeded by
+"seed" so a restarted sweep draws the same trials.
+
+Every trial trains then evaluates in a worker of a process pool sized by the
+CPU budget. Finished trials are cached in <dossier>/trials/<cle>.json (the
+key hashes everything that changes the result), so an interrupted sweep
+resumes where it stopped. The ranked leaderboard goes to
+<dossier>/leaderboard.csv.
+"""
+
+import contextlib
+import csv
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+import time
+from dataclasses import asdict, fields, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from Board.config import EnvConfig, DEFAULT_CONFIG
+
+HYPERPARAMS = ("alpha", "gamma", "eps_start", "eps_end")
+REWARD_PREFIX = "rewards."
+
+SWEEP_DEFAULTS = {
+    "method": "grid",
+    "trials": 20,
+    "episodes": 5000,
+    "games": 200,
+    "seed": 0,
+}
+
+Trial = Dict[str, float]
+
+
+def load_sweep(path: str) -> Dict[str, Any]:
+    """Read and check a sweep file. Raises ValueError with the reason."""
+    try:
+        with open(path) as f:
+            spec = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Sweep illisible ({path}): {e}")
+
+    spec = dict(SWEEP_DEFAULTS, **spec)
+    if spec["method"] not in ("grid", "random"):
+        raise ValueError(f"Methode de sweep inconnue: {spec['method']} (grid ou random)")
+    params = spec.get("params")
+    if not isinstance(params, dict) or not params:
+        raise ValueError("Le sweep doit definir au moins un parametre dans \"params\"")
+
+    reward_names = {f.name for f in fields(DEFAULT_CONFIG.rewards)}
+    for name, space in params.items():
+        if name.startswith(REWARD_PREFIX):
+            if name[len(REWARD_PREFIX):] not in reward_names:
+                raise ValueError(f"Reward inconnu: {name}")
+        elif name not in HYPERPARAMS:
+            raise ValueError(f"Parametre inconnu: {name} "
+                             f"({', '.join(HYPERPARAMS)} ou {REWARD_PREFIX}<nom>)")
+        if isinstance(space, list):
+            if not space:
+                raise ValueError(f"{name}: liste de valeurs vide")
+        elif isinstance(space, dict):
+            if spec["method"] == "grid":
+                raise ValueError(f"{name}: un sweep grid demande une liste de valeurs")
+            if "min" not in space or "max" not in space:
+                raise ValueError(f"{name}: un intervalle demande min et max")
+            if space.get("log") and min(space["min"], space["max"]) <= 0:
+                raise ValueError(f"{name}: un intervalle log demande des bornes > 0")
+        else:
+            raise ValueError(f"{name}: liste de valeurs ou {{min, max}} attendu")
+    for key in ("trials", "episodes", "games"):
+        if spec[key] < 1:
+            raise ValueError(f"\"{key}\" doit etre >= 1")
+    return spec
+
+
+def _draw(space: Any, rng: random.Random) -> float:
+    if isinstance(space, list):
+        return rng.choice(space)
+    low, high = space["min"], space["max"]
+    if space.get("log"):
+        return math.exp(rng.uniform(math.log(low), math.log(high)))
+    return rng.uniform(low, high)
+
+
+def expand_trials(spec: Dict[str, Any]) -> List[Trial]:
+    """The trials of the sweep, always in the same order."""
+    names = sorted(spec["params"])
+    if spec["method"] == "grid":
+        values = [spec["params"][name] for name in names]
+        return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+    rng = random.Random(spec["seed"])
+    return [{name: _draw(spec["params"][name], rng) for name in names}
+            for _ in range(spec["trials"])]
+
+
+def trial_config(trial: Trial, config: EnvConfig) -> Tuple[EnvConfig, Dict[str, float]]:
+    """Board config with the trial rewards, and the train_mode hyperparameters."""
+    rewards = {name[len(REWARD_PREFIX):]: value for name, value in trial.items()
+               if name.startswith(REWARD_PREFIX)}
+    hyper = {name: value for name, value in trial.items() if name in HYPERPARAMS}
+    if rewards:
+        config = replace(config, rewards=config.rewards.override(rewards))
+    return config, hyper
+
+
+def trial_key(trial: Trial, spec: Dict[str, Any], config: EnvConfig,
+              use_safety: bool) -> str:
+    """Hash of everything that changes the result of a trial."""
+    identity = {
+        "params": trial,
+        "episodes": spec["episodes"],
+        "games": spec["games"],
+        "seed": spec["seed"],
+        "board": [config.width, config.height, config.green_apples,
+                  config.red_apples, config.max_steps_without_food],
+        "rewards": asdict(config.rewards),
+        "use_safety": use_safety,
+    }
+    raw = json.dumps(identity, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _run_trial(task: Tuple[str, Trial, str, EnvConfig, Dict[str, Any], bool]) -> Dict[str, Any]:
+    """Train then evaluate one trial; the mode output goes to <cle>.log."""
+    from modes.game_modes import train_mode, evaluate_mode
+
+    key, trial, folder, config, spec, use_safety = task
+    board, hyper = trial_config(trial, config)
+    base = os.path.join(folder, key)
+    model_path = f"{base}.l2s"
+
+    start = time.perf_counter()
+    with open(f"{base}.log", "w") as log, contextlib.redirect_stdout(log):
+        train_mode(spec["episodes"], model_path, config=board, seed=spec["seed"],
+                   **hyper)
+        stats = evaluate_mode(spec["games"], model_path, use_safety=use_safety,
+                              config=board, seed=spec["seed"])
+
+    result = {
+        "key": key,
+        "params": trial,
+        "stats": stats,
+        "model": model_path,
+        "episodes": spec["episodes"],
+        "seconds": time.perf_counter() - start,
+    }
+    # le .json marque l'essai comme termine: ecrit en dernier
+    _write_json(f"{base}.json", result)
+    return result
+
+
+def _load_cached(folder: str, key: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(folder, f"{key}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _format_params(params: Trial) -> str:
+    return " ".join(f"{name}={value:.4g}" if isinstance(value, float)
+                    else f"{name}={value}" for name, value in sorted(params.items()))
+
+
+def rank(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Best first: mean length, then the >=10 rate, then the max."""
+    return sorted(results, key=lambda r: (r["stats"]["mean"], r["stats"]["rate_10"],
+                                          r["stats"]["max"]), reverse=True)
+
+
+def write_leaderboard(path: str, ranked: List[Dict[str, Any]]) -> None:
+    names = sorted({name for r in ranked for name in r["params"]})
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["rank", "key", "mean", "min", "max", "rate_5", "rate_10",
+                         "seconds", "model"] + names)
+        for i, r in enumerate(ranked, start=1):
+            s = r["stats"]
+            writer.writerow([i, r["key"], f"{s['mean']:.3f}", s["min"], s["max"],
+                             f"{s['rate_5']:.3f}", f"{s['rate_10']:.3f}",
+                             f"{r['seconds']:.1f}", r["model"]]
+                            + [r["params"].get(name, "") for name in names])
+    os.replace(tmp, path)
+
+
+def sweep_mode(sweep_path: str, config: EnvConfig = DEFAULT_CONFIG,
+               workers: int = 1, use_safety: bool = True,
+               out_dir: Optional[str] = None, top: int = 10) -> List[Dict[str, Any]]:
+    """
+    Run the sweep described by sweep_path with at most `workers` trials at
+    once (un essai = un processus). Trials already in the cache are not
+    rerun. Returns the ranked results.
+    """
+    spec = load_sweep(sweep_path)
+    folder = out_dir or os.path.splitext(sweep_path)[0]
+    trials_dir = os.path.join(folder, "trials")
+    os.makedirs(trials_dir, exist_ok=True)
+
+    trials = expand_trials(spec)
+    results = []
+    pending = []
+    for trial in trials:
+        key = trial_key(trial, spec, config, use_safety)
+        cached = _load_cached(trials_dir, key)
+        if cached is not None:
+            results.append(cached)
+        else:
+            pending.append((key, trial, trials_dir, config, spec, use_safety))
+
+    workers = max(1, min(workers, os.cpu_count() or 1, len(pending) or 1))
+
+    print(f"\n{'='*60}")
+    print(f"  MODE SWEEP ({spec['method']}) - {len(trials)} essais")
+    print(f"{'='*60}")
+    print(f"  Fichier: {sweep_path} -> {folder}")
+    print(f"  Parametres: {', '.join(sorted(spec['params']))}")
+    print(f"  Par essai: {spec['episodes']} episodes + {spec['games']} parties | seed {spec['seed']}")
+    print(f"  Plateau: {config.width}x{config.height}")
+    print(f"  En cache: {len(results)} | a faire: {len(pending)} | workers: {workers}")
+    print(f"{'='*60}\n")
+
+    interrupted = False
+    pool = None
+    try:
+        if workers == 1:
+            finished = map(_run_trial, pending)
+        else:
+            from modes.parallel import _pool_context
+            pool = _pool_context().Pool(workers)
+            finished = pool.imap_unordered(_run_trial, pending)
+        for result in finished:
+            results.append(result)
+            s = result["stats"]
+            print(f"Essai {len(results):4d}/{len(trials)} | {result['key']} | "
+                  f"mean={s['mean']:5.2f} | >=10={100*s['rate_10']:5.1f}% | "
+                  f"{result['seconds']:6.1f}s | {_format_params(result['params'])}")
+    except KeyboardInterrupt:
+        interrupted = True
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    ranked = rank(results)
+    board_path = os.path.join(folder, "leaderboard.csv")
+    if ranked:
+        write_leaderboard(board_path, ranked)
+
+    if interrupted:
+        print(f"\nInterrompu: {len(results)}/{len(trials)} essais en cache, "
+              f"relancer la meme commande pour reprendre")
+
+    print(f"\n{'='*60}")
+    print(f"  CLASSEMENT ({len(ranked)}/{len(trials)} essais)")
+    print(f"{'='*60}")
+    for i, r in enumerate(ranked[:top], start=1):
+        s = r["stats"]
+        print(f"  {i:2d}. mean={s['mean']:5.2f} max={s['max']:2d} "
+              f">=10={100*s['rate_10']:5.1f}% | {_format_params(r['params'])}")
+    if ranked:
+        print(f"\n  Meilleur modele: {ranked[0]['model']}")
+        print(f"  Classement complet: {board_path}")
+    print(f"{'='*60}\n")
+    return ranked
@@ -1,9 +1,6 @@
 """ASCII rendering functions for terminal display."""
 
-import os
 import sys
-import termios
-import tty
 
 from Board.environment import Environment
 
@@ -17,6 +14,9 @@ KEY_LEFT = "\x1b[D"
 
 def get_key() -> str:
     """Read a single key press from terminal."""
+    import termios
+    import tty
+
     fd = sys.stdin.fileno()
     old_settings = termios.tcgetattr(fd)
     try:
@@ -27,39 +27,100 @@ def get_key() -> str:
     return key
 
 
+# Sequences ANSI
+HOME = "\033[H"
+CLEAR = "\033[2J"
+CLEAR_BELOW = "\033[J"
+CLEAR_LINE = "\033[K"
+
+GREEN = "\033[92m"
+RED = "\033[91m"
+BLUE = "\033[94m"
+YELLOW = "\033[93m"
+RESET = "\033[0m"
+BOLD = "\033[1m"
+
+# Case -> texte affiche, indexe par les codes de Environment.cells
+_TOKENS = (".", f"{BLUE}o{RESET}", f"{GREEN}G{RESET}", f"{RED}R{RESET}")
+_HEAD = f"{YELLOW}O{RESET}"
+
+
 def clear_screen() -> None:
-    """Clear the terminal screen."""
-    os.system("clear" if os.name == "posix" else "cls")
+    """Clear the terminal screen (ANSI, no subprocess)."""
+    sys.stdout.write(CLEAR + HOME)
+    sys.stdout.flush()
 
 
-def display_grid_ascii(env: Environment, show_info: bool = True) -> None:
-    """Display the game grid in ASCII format."""
-    clear_screen()
-    GREEN = "\033[92m"
-    RED = "\033[91m"
-    BLUE = "\033[94m"
-    YELLOW = "\033[93m"
-    RESET = "\033[0m"
-    BOLD = "\033[1m"
-
-    print(f"\n{BOLD}+{'=' * 21}+{RESET}")
-    for y in range(len(env.grid)):
-        print(f"{BOLD}|{RESET}", end=" ")
-        for x in range(len(env.grid[0])):
-            pos = (x, y)
-            if pos == env.snake[0]:
-                print(f"{YELLOW}O{RESET}", end=" ")
-            elif pos in env.snake:
-                print(f"{BLUE}o{RESET}", end=" ")
-            elif pos in env.green_apples:
-                print(f"{GREEN}G{RESET}", end=" ")
-            elif pos == env.red_apple:
-                print(f"{RED}R{RESET}", end=" ")
-            else:
-                print(".", end=" ")
-        print(f"{BOLD}|{RESET}")
-    print(f"{BOLD}+{'=' * 21}+{RESET}")
+class AsciiRenderer:
+    """
+    Rendu terminal bufferise: chaque frame est ecrite en un seul write().
+    La premiere frame (ou apres invalidate / changement de taille) est
+    complete, depuis le coin haut-gauche; les suivantes ne reecrivent que
+    les cases modifiees (positionnement du curseur) et les lignes d'info.
+
+    Ligne 1: bordure, lignes 2..h+1: plateau, ligne h+2: bordure, puis une
+    ligne vide et les lignes d'info. La case (x, y) est en colonne 3 + 2x.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+        self._tokens = None
+        self._size = None
+        self._info_lines = 0
+
+    def invalidate(self) -> None:
+        """Force a full redraw at the next frame (screen written by others)."""
+        self._tokens = None
 
+    def _cell_tokens(self, env: Environment) -> list:
+        tokens = [_TOKENS[c] for c in env.cells]
+        x, y = env.snake[0]
+        tokens[y * env.width + x] = _HEAD
+        return tokens
+
+    def _full_frame(self, tokens: list, width: int, height: int) -> str:
+        border = f"{BOLD}+{'=' * (2 * width + 1)}+{RESET}"
+        rows = [
+            f"{BOLD}|{RESET} {' '.join(tokens[y * width:(y + 1) * width])} {BOLD}|{RESET}"
+            for y in range(height)
+        ]
+        return CLEAR + HOME + "\n".join([border, *rows, border]) + "\n"
+
+    def _diff_frame(self, tokens: list, width: int) -> str:
+        parts = []
+        for i, (new, old) in enumerate(zip(tokens, self._tokens)):
+            if new is not old:
+                y, x = divmod(i, width)
+                parts.append(f"\033[{y + 2};{3 + 2 * x}H{new}")
+        return "".join(parts)
+
+    def draw(self, env: Environment, info=()) -> None:
+        """Render env, then the `info` lines below the board."""
+        width, height = env.width, env.height
+        tokens = self._cell_tokens(env)
+        if self._tokens is None or self._size != (width, height):
+            frame = self._full_frame(tokens, width, height)
+        else:
+            frame = self._diff_frame(tokens, width)
+        self._tokens = tokens
+        self._size = (width, height)
+
+        info_row = height + 4
+        lines = [f"\033[{info_row + i};1H{line}{CLEAR_LINE}"
+                 for i, line in enumerate(info)]
+        # curseur sous la frame: input() / print() n'ecrivent pas dans le plateau
+        tail = f"\033[{info_row + len(info)};1H{CLEAR_BELOW}"
+        self.stream.write(frame + "".join(lines) + tail)
+        self.stream.flush()
+
+
+_renderer = AsciiRenderer()
+
+
+def display_grid_ascii(env: Environment, show_info: bool = True) -> None:
+    """Display the game grid in ASCII format (diff redraw, see AsciiRenderer)."""
+    info = ()
     if show_info:
-        print(f"\n{BOLD}Longueur:{RESET} {len(env.snake)}")
-        print(f"{BOLD}Etat:{RESET} {env.get_state()}")
+        info = (f"{BOLD}Longueur:{RESET} {len(env.snake)}",
+                f"{BOLD}Etat:{RESET} {env.get_state()}")
+    _renderer.draw(env, info)
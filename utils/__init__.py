@@ -1,5 +1,12 @@
 """Utils package for Learn2Slither."""
 
-from utils.io import save_model, load_model, QTable
-
 __all__ = ["save_model", "load_model", "QTable"]
+
+
+def __getattr__(name):
+    # Re-exports charges a la demande: importer un sous-module leger
+    # (utils.importprof, ...) ne tire pas numpy via utils.io
+    if name in __all__:
+        from utils import io
+        return getattr(io, name)
+    raise AttributeError(f"module 'utils' has no attribute '{name}'")
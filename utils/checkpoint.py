@@ -0,0 +1,123 @@
+"""Incremental training checkpoints written from a background thread.
+
+A checkpoint is a base file (binary model format, see utils.io) plus delta
+files `<base>.dNNNN` holding only the rows changed since the previous
+snapshot. Every file is written atomically; the latest delta's header carries
+the training state (episode, epsilon schedule, RNG state, best length).
+"""
+
+import glob
+import os
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from agent.dense import DenseQTable, SparseQTable
+from utils.io import read_binary_model, write_model
+
+
+def checkpoint_path(save_path: str) -> str:
+    """Checkpoint base file associated with a model path."""
+    return f"{save_path}.ckpt"
+
+
+def _delta_paths(path: str) -> List[str]:
+    return sorted(glob.glob(f"{glob.escape(path)}.d[0-9][0-9][0-9][0-9]"))
+
+
+def checkpoint_exists(path: str) -> bool:
+    return os.path.exists(path)
+
+
+def load_checkpoint(path: str) -> Tuple[DenseQTable, Dict[str, Any]]:
+    """Rebuild the Q-table from the base file and its deltas."""
+    base, meta = read_binary_model(path)
+    q = base.to_dense()
+    for delta_path in _delta_paths(path):
+        delta, meta = read_binary_model(delta_path)
+        q.values[delta.keys] = delta.values
+        q.seen[delta.keys] = True
+        if delta.visits is not None:
+            q.visits[delta.keys] = delta.visits
+    return q, meta
+
+
+def remove_checkpoint(path: str) -> None:
+    for p in _delta_paths(path) + [path]:
+        if os.path.exists(p):
+            os.remove(p)
+
+
+class Checkpointer:
+    """
+    snapshot() copies the Q-table (a memcpy) and hands it to a writer thread,
+    so the training loop never waits on disk. If the previous snapshot is
+    still being written the new one is skipped: the next delta is computed
+    against the last written state, so nothing is lost.
+    """
+
+    def __init__(self, path: str, compact_every: int = 20):
+        self.path = path
+        self.compact_every = compact_every
+        self._last: Optional[DenseQTable] = None
+        self._deltas = 0
+        self.skipped = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def resume_from(self, q: DenseQTable) -> None:
+        """Use a restored table as the reference for the next delta.
+        Without a base on disk (reprise depuis un modele), the next snapshot
+        writes one: deltas alone would be ignored by the next resume."""
+        if not checkpoint_exists(self.path):
+            return
+        self._last = q.copy()
+        self._deltas = len(_delta_paths(self.path))
+
+    def snapshot(self, q: DenseQTable, metadata: Dict[str, Any],
+                 wait: bool = False) -> bool:
+        """Queue a snapshot. Returns False if the writer is still busy
+        (unless `wait`, which blocks until it can be queued)."""
+        try:
+            self._queue.put((q.copy(), dict(metadata)), block=wait)
+            return True
+        except queue.Full:
+            self.skipped += 1
+            return False
+
+    def close(self) -> None:
+        """Wait for pending writes and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            q, metadata = item
+            self._write(q, metadata)
+
+    def _write(self, q: DenseQTable, metadata: Dict[str, Any]) -> None:
+        # Un delta ne sait qu'ajouter des etats: apres une eviction
+        # (agent.pruning), on repart d'une nouvelle base
+        evicted = self._last is not None and (self._last.seen & ~q.seen).any()
+        if self._last is None or self._deltas >= self.compact_every or evicted:
+            # Nouvelle base: les deltas precedents deviennent inutiles. Ils
+            # sont supprimes avant, sinon un crash entre les deux les
+            # appliquerait sur la nouvelle base
+            for p in _delta_paths(self.path):
+                os.remove(p)
+            write_model(q, self.path, metadata)
+            self._deltas = 0
+        else:
+            changed = (q.values != self._last.values).any(axis=1)
+            changed |= q.visits != self._last.visits
+            rows = np.flatnonzero(changed | (q.seen != self._last.seen))
+            self._deltas += 1
+            delta = SparseQTable(rows, q.values[rows], q.visits[rows])
+            write_model(delta, f"{self.path}.d{self._deltas:04d}", metadata)
+        self._last = q
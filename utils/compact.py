@@ -0,0 +1,62 @@
+"""Compact a model: drop the rarely visited states still at their initial values.
+
+Usage: python -m utils.compact models/m.l2s models/m.compact.l2s [--min-visits 3] [--tolerance 0.5]
+See agent.pruning for the criterion. Models without visit counters (legacy
+pickles, models saved before the counters) are compacted on the values
+alone.
+"""
+
+import argparse
+import os
+
+from agent.pruning import compact, footprint
+from utils.io import read_model, write_model
+
+
+def _kib(n: int) -> str:
+    return f"{n / 1024:.1f} Kio"
+
+
+def compact_model(path: str, out: str, min_visits: int = 3,
+                  tolerance: float = 0.5) -> int:
+    """Compact one model into `out`, print the footprint before and after.
+    Returns the number of dropped states."""
+    table, meta = read_model(path)
+    q = table.to_dense()
+    has_visits = bool(q.visits.any())
+    before = footprint(q)
+    size_before = os.path.getsize(path)
+
+    dropped = compact(q, min_visits if has_visits else 1, tolerance)
+    after = footprint(q)
+    meta = dict(meta, compacted={"min_visits": min_visits, "tolerance": tolerance,
+                                 "dropped": dropped})
+    write_model(q, out, meta)
+
+    print(f"{path} -> {out}")
+    if not has_visits:
+        print("  Pas de compteurs de visites: critere sur les valeurs seulement")
+    print(f"  Etats: {before['states']} -> {after['states']} ({dropped} supprimes)")
+    print(f"  Table creuse: {_kib(before['sparse_bytes'])} -> {_kib(after['sparse_bytes'])}")
+    print(f"  Fichier: {_kib(size_before)} -> {_kib(os.path.getsize(out))}")
+    print(f"  Table dense en memoire (fixe): {_kib(after['dense_bytes'])}")
+    return dropped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compaction d'un modele")
+    parser.add_argument("path", help="Modele a compacter")
+    parser.add_argument("out", help="Modele compacte")
+    parser.add_argument("--min-visits", type=int, default=3,
+                        help="Etats visites moins de N fois supprimables (defaut: 3)")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Ecart max a la valeur initiale (defaut: 0.5)")
+    args = parser.parse_args()
+    try:
+        compact_model(args.path, args.out, args.min_visits, args.tolerance)
+    except (OSError, ValueError) as e:
+        print(f"Erreur: {e}")
+
+
+if __name__ == "__main__":
+    main()
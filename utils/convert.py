@@ -0,0 +1,37 @@
+"""Convert legacy pickle models to the binary model format.
+
+Usage: python -m utils.convert models/5000sess.pkl models/Snake_3.0.plk [--out-dir DIR]
+Each input is written next to it (or in --out-dir) with the .l2s extension.
+"""
+
+import argparse
+import os
+
+from utils.io import is_binary_model, read_legacy_model, write_model
+
+
+def convert_model(path: str, out_dir: str = "") -> str:
+    """Convert one legacy model. Returns the path written."""
+    q, episodes = read_legacy_model(path)
+    base = os.path.splitext(os.path.basename(path))[0] + ".l2s"
+    out = os.path.join(out_dir or os.path.dirname(path), base)
+    count = write_model(q, out, {"episodes": episodes, "source": os.path.basename(path)})
+    print(f"{path} -> {out} ({count} etats, {episodes} episodes)")
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Conversion pickle -> format binaire")
+    parser.add_argument("paths", nargs="+", help="Modeles pickle a convertir")
+    parser.add_argument("--out-dir", default="", help="Dossier de sortie")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        if is_binary_model(path):
+            print(f"{path}: deja au format binaire")
+            continue
+        convert_model(path, args.out_dir)
+
+
+if __name__ == "__main__":
+    main()
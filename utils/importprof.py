@@ -0,0 +1,79 @@
+"""Per-module import timing (--profile-import).
+
+Wraps builtins.__import__ and records, for every module loaded for the
+first time, the cumulative time of the import and its self time (minus
+the nested imports it triggered).
+"""
+
+import builtins
+import sys
+import time
+from importlib.util import resolve_name
+from typing import Dict, List, Tuple
+
+# module -> (cumulative ns, self ns)
+ImportTimes = Dict[str, Tuple[int, int]]
+
+
+class ImportProfiler:
+    """Context manager timing the imports done while it is active."""
+
+    def __init__(self):
+        self.times: ImportTimes = {}
+        self._stack: List[int] = []
+        self._original = None
+
+    def _resolve(self, name: str, globals_, level: int) -> str:
+        if level == 0:
+            return name
+        package = (globals_ or {}).get("__package__") or ""
+        try:
+            return resolve_name("." * level + name, package)
+        except (ImportError, ValueError):
+            return name
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        target = self._resolve(name, globals, level)
+        # `from pkg import sub` charge pkg.sub sans repasser par __import__
+        candidates = [target] + [f"{target}.{item}" for item in fromlist or ()
+                                 if item != "*"]
+        missing = [c for c in candidates if c not in sys.modules]
+        if not missing:
+            return self._original(name, globals, locals, fromlist, level)
+
+        self._stack.append(0)
+        start = time.perf_counter_ns()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            for module in missing:
+                if module in sys.modules:
+                    self.times[module] = (elapsed, elapsed - nested)
+                    break
+
+    def __enter__(self) -> "ImportProfiler":
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def __exit__(self, *exc) -> None:
+        builtins.__import__ = self._original
+
+    def report(self, top: int = 25) -> str:
+        """Table of the slowest imports, sorted by cumulative time."""
+        total = sum(self_ns for _, self_ns in self.times.values())
+        rows = sorted(self.times.items(), key=lambda item: -item[1][0])
+        lines = [
+            f"{'='*60}",
+            f"  IMPORTS ({len(self.times)} modules, {total / 1e6:.1f} ms)",
+            f"{'='*60}",
+            f"  {'module':<36} {'cumul ms':>9} {'self ms':>9}",
+        ]
+        for name, (cumulative, self_ns) in rows[:top]:
+            lines.append(f"  {name:<36} {cumulative / 1e6:>9.2f} {self_ns / 1e6:>9.2f}")
+        lines.append(f"{'='*60}")
+        return "\n".join(lines)
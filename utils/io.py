@@ -1,42 +1,142 @@
-"""Utility functions for saving and loading models."""
+"""Utility functions for saving and loading models.
 
+Binary model format (little-endian):
+
+    magic        4s      b"L2SQ"
+    version      uint16  FORMAT_VERSION
+    reserved     uint16
+    header_len   uint32
+    header       JSON    metadata (episodes, states_count, encoding_version, ...)
+    padding      -> offset multiple of 16
+    keys         uint32[states_count]      encoded states, sorted
+    values       float32[states_count, 4]  Q-values, same order as keys
+    visits       uint32[states_count]      visit counters, only if the
+                                           header has "visits": true
+
+load_model memory-maps the key table and the value block without copying.
+The legacy pickle formats (dict with metadata, or bare Q-table dict) still
+load, converted to a DenseQTable.
+"""
+
+import json
+import mmap
 import os
 import pickle
-from typing import Dict, List, Tuple, Any
+import struct
+from typing import Any, Dict, Optional, Tuple, Union
 
-QTable = Dict[Tuple, List[float]]
+import numpy as np
 
+from agent.agent import QTable
+from agent.dense import DenseQTable, SparseQTable
+from agent.encoding import ENCODING_VERSION
 
-def save_model(q: QTable, path: str, episodes: int = 0) -> None:
-    """Save Q-table to file with metadata."""
+MAGIC = b"L2SQ"
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<4sHHI")
+_ALIGN = 16
+
+ModelTable = Union[DenseQTable, SparseQTable]
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _sparse_rows(q: Union[QTable, ModelTable]
+                 ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """Sorted encoded states, their Q-values and visit counters (None if
+    the table has never counted any)."""
+    if isinstance(q, dict):
+        q = DenseQTable.from_dict(q)
+    if isinstance(q, SparseQTable):
+        return q.keys, q.values, q.visits
+    keys = np.flatnonzero(q.seen)
+    visits = q.visits[keys] if q.visits.any() else None
+    return keys, q.values[keys], visits
+
+
+def write_model(q: Union[QTable, ModelTable], path: str,
+                metadata: Dict[str, Any]) -> int:
+    """Write the binary model atomically (tmp file + rename). Returns state count."""
     folder = os.path.dirname(path)
     if folder:
         os.makedirs(folder, exist_ok=True)
-    
-    # Sauvegarder Q-table + metadata
-    data = {
-        "q_table": q,
-        "episodes": episodes,
-        "states_count": len(q),
-    }
-    
-    with open(path, "wb") as f:
-        pickle.dump(data, f)
-    print(f"Modele sauvegarde: {path} ({len(q)} etats, {episodes} episodes)")
-
-
-def load_model(path: str) -> Tuple[QTable, int]:
-    """Load Q-table from file with metadata.
-    
-    Returns:
-        Tuple of (Q-table, total_episodes)
-    """
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Fichier non trouve: {path}")
-    
+
+    keys, values, visits = _sparse_rows(q)
+    meta = dict(metadata)
+    meta["states_count"] = int(len(keys))
+    meta["visits"] = visits is not None
+    meta["encoding_version"] = ENCODING_VERSION
+    header = json.dumps(meta, sort_keys=True).encode("utf-8")
+
+    offset = _PREFIX.size + len(header)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, 0, len(header)))
+        f.write(header)
+        f.write(b"\0" * (_align(offset) - offset))
+        f.write(np.ascontiguousarray(keys, dtype="<u4").tobytes())
+        f.write(np.ascontiguousarray(values, dtype="<f4").tobytes())
+        if visits is not None:
+            f.write(np.ascontiguousarray(visits, dtype="<u4").tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return meta["states_count"]
+
+
+def save_model(q: Union[QTable, ModelTable], path: str, episodes: int = 0,
+               metadata: Optional[Dict[str, Any]] = None) -> None:
+    """Save Q-table to file with metadata."""
+    meta = dict(metadata or {})
+    meta["episodes"] = episodes
+    count = write_model(q, path, meta)
+    print(f"Modele sauvegarde: {path} ({count} etats, {episodes} episodes)")
+
+
+def is_binary_model(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def read_binary_model(path: str) -> Tuple[SparseQTable, Dict[str, Any]]:
+    """Memory-map a binary model. Returns (table, metadata)."""
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, _, header_len = _PREFIX.unpack_from(mm, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Format de modele inconnu: {path}")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Version de format non supportee ({version}): {path}")
+
+    header_end = _PREFIX.size + header_len
+    meta = json.loads(bytes(mm[_PREFIX.size:header_end]).decode("utf-8"))
+    if meta.get("encoding_version") != ENCODING_VERSION:
+        raise ValueError(
+            f"Encodage des etats incompatible "
+            f"({meta.get('encoding_version')} != {ENCODING_VERSION}): {path}"
+        )
+
+    count = meta["states_count"]
+    keys_offset = _align(header_end)
+    values_offset = keys_offset + 4 * count
+    keys = np.frombuffer(mm, dtype="<u4", count=count, offset=keys_offset)
+    values = np.frombuffer(mm, dtype="<f4", count=4 * count,
+                           offset=values_offset).reshape(count, 4)
+    visits = None
+    if meta.get("visits"):
+        visits = np.frombuffer(mm, dtype="<u4", count=count,
+                               offset=values_offset + 16 * count)
+    return SparseQTable(keys, values, visits), meta
+
+
+def read_legacy_model(path: str) -> Tuple[QTable, int]:
+    """Unpickle a legacy model. Returns (dict Q-table, episodes)."""
     with open(path, "rb") as f:
         data = pickle.load(f)
-    
+
     # Support ancien format (juste Q-table) et nouveau format (dict avec metadata)
     if isinstance(data, dict) and "q_table" in data:
         q = data["q_table"]
@@ -52,7 +152,30 @@ def load_model(path: str) -> Tuple[QTable, int]:
                 episodes = int(name.split("sess")[0])
             except ValueError:
                 episodes = 0
-    
+    return q, episodes
+
+
+def read_model(path: str) -> Tuple[ModelTable, Dict[str, Any]]:
+    """Read any supported model format. Returns (Q-table, metadata)."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Fichier non trouve: {path}")
+
+    if is_binary_model(path):
+        return read_binary_model(path)
+    q_dict, episodes = read_legacy_model(path)
+    return DenseQTable.from_dict(q_dict), {"episodes": episodes}
+
+
+def load_model(path: str) -> Tuple[ModelTable, int]:
+    """Load Q-table from file with metadata.
+
+    Returns:
+        Tuple of (Q-table, total_episodes). Binary models come back as a
+        memory-mapped SparseQTable, legacy pickles as a DenseQTable.
+    """
+    q, meta = read_model(path)
+    episodes = meta.get("episodes", 0)
+
     print(f"\n{'='*50}")
     print(f"  MODELE CHARGE")
     print(f"{'='*50}")
@@ -60,5 +183,5 @@ def load_model(path: str) -> Tuple[QTable, int]:
     print(f"  Episodes d'entrainement: {episodes}")
     print(f"  Etats dans Q-table: {len(q)}")
     print(f"{'='*50}\n")
-    
+
     return q, episodes
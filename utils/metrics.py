@@ -0,0 +1,148 @@
+"""Per-episode metrics written to JSONL or CSV from a background thread.
+
+record() stores the row tuple in a preallocated ring buffer (one list
+assignment, no formatting, no I/O). Every `batch` rows the filled slice is handed to a
+writer thread which formats and appends it to the file. The ring holds
+RING_BATCHES batches and the hand-off queue at most RING_BATCHES - 2, so a
+slow writer blocks record() instead of overwriting unwritten rows.
+"""
+
+import json
+import os
+import queue
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+RING_BATCHES = 4
+
+TRAIN_FIELDS = ("episode", "length", "steps", "return", "epsilon",
+                "q_states", "steps_per_sec")
+TRAIN_INTEGERS = ("episode", "length", "steps", "q_states")
+
+EVAL_FIELDS = ("game", "length", "steps")
+
+# Evaluations periodiques pendant l'entrainement (--eval-every)
+EVAL_CURVE_FIELDS = ("episode", "games", "mean", "half_width", "max", "rate_10")
+EVAL_CURVE_INTEGERS = ("episode", "games", "max")
+
+
+def eval_curve_path(path: str) -> str:
+    """logs/train.jsonl -> logs/train.eval.jsonl"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.eval{ext}"
+
+
+def truncate_after(path: str, field: str, last: int) -> int:
+    """
+    Drop the rows of a metrics file whose `field` is greater than `last`,
+    and a torn line left by a killed writer. Used on resume: the episodes
+    flushed after the checkpoint are played again.
+    Returns the number of dropped rows.
+    """
+    csv = path.endswith(".csv")
+    with open(path) as f:
+        lines = f.readlines()
+    kept = lines[:1] if csv else []
+    column = lines[0].rstrip("\n").split(",").index(field) if csv and lines else 0
+    for line in lines[len(kept):]:
+        try:
+            if not line.endswith("\n"):
+                raise ValueError("ligne tronquee")
+            value = int(line.split(",")[column]) if csv else json.loads(line)[field]
+        except (ValueError, IndexError, KeyError):
+            continue
+        if value <= last:
+            kept.append(line)
+
+    dropped = len(lines) - len(kept)
+    if dropped:
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.writelines(kept)
+        os.replace(tmp, path)
+    return dropped
+
+
+class MetricsSink:
+    """
+    Append-only metrics stream. The format follows the extension of `path`:
+    `.csv` writes a header then one line per row, anything else JSONL.
+    Rows are formatted with a %-template built once from the field names;
+    fields listed in `integers` are written as ints. With `append`, rows are
+    added to an existing file (the CSV header is not repeated); `keep_until`
+    first drops its rows whose first field is past that value (reprise
+    apres un checkpoint, voir truncate_after).
+    """
+
+    def __init__(self, path: str, fields: Sequence[str],
+                 integers: Sequence[str] = (), batch: int = 256,
+                 append: bool = False, keep_until: Optional[int] = None):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        self.path = path
+        self.fields = tuple(fields)
+        self.batch = batch
+        self._ring: List[Optional[Tuple]] = [None] * (RING_BATCHES * batch)
+        self._pos = 0        # prochaine ligne du ring
+        self._start = 0      # debut du batch en cours
+        self.rows = 0
+
+        formats = ["%d" if f in integers else "%r" for f in self.fields]
+        csv = path.endswith(".csv")
+        if csv:
+            self._template = ",".join(formats) + "\n"
+        else:
+            self._template = "{" + ", ".join(
+                f'"{f}": {fmt}' for f, fmt in zip(self.fields, formats)
+            ) + "}\n"
+
+        append = append and os.path.exists(path)
+        if append and keep_until is not None:
+            truncate_after(path, self.fields[0], keep_until)
+        self._file = open(path, "a" if append else "w")
+        if csv and not append:
+            self._file.write(",".join(self.fields) + "\n")
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=RING_BATCHES - 2)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def record(self, *values: float) -> None:
+        """Store one row, values in the order of `fields`."""
+        self._ring[self._pos] = values
+        self._pos += 1
+        self.rows += 1
+        if self._pos - self._start == self.batch:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._pos > self._start:
+            self._queue.put((self._start, self._pos))
+        if self._pos == len(self._ring):
+            self._pos = 0
+        self._start = self._pos
+
+    def close(self) -> None:
+        """Write the pending rows and stop the writer thread."""
+        self._flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+    def __enter__(self) -> "MetricsSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while True:
+            item: Optional[Tuple[int, int]] = self._queue.get()
+            if item is None:
+                return
+            start, stop = item
+            template = self._template
+            self._file.writelines(template % row for row in self._ring[start:stop])
+            self._file.flush()
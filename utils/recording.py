@@ -0,0 +1,182 @@
+"""Compact game recordings (.l2sr) for replaying evaluation games.
+
+Layout (little-endian), same prefix scheme as the model format:
+
+    magic        4s      b"L2SR"
+    version      uint16  RECORDING_VERSION
+    reserved     uint16
+    header_len   uint32
+    header       JSON    board, seed, initial snake and apples, counts, ...
+    actions      2 bits per action (UP, RIGHT, DOWN, LEFT), 4 per byte
+    spawns       uint16[spawns_count]  cell (y * width + x) of each apple
+                 spawned during the game, in order (optional)
+
+With the spawns the replay needs no RNG. Without them (spawns_count = -1)
+the environment is rebuilt from the environment stream of `seed`
+(Board.environment.make_rngs), as evaluation games are played.
+"""
+
+import json
+import os
+import random
+import struct
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from Board.config import EnvConfig
+from Board.environment import Environment, make_rngs
+
+MAGIC = b"L2SR"
+RECORDING_VERSION = 1
+_PREFIX = struct.Struct("<4sHHI")
+
+Cell = Tuple[int, int]
+
+# Meme ordre que modes.game_modes.ACTIONS
+ACTION_DIRECTIONS = [Environment.UP, Environment.RIGHT, Environment.DOWN,
+                     Environment.LEFT]
+
+
+def pack_actions(actions: List[int]) -> bytes:
+    """2 bits per action, first action in the low bits of the first byte."""
+    packed = bytearray((len(actions) + 3) // 4)
+    for i, action in enumerate(actions):
+        packed[i >> 2] |= action << ((i & 3) * 2)
+    return bytes(packed)
+
+
+def unpack_actions(packed: bytes, count: int) -> List[int]:
+    return [(packed[i >> 2] >> ((i & 3) * 2)) & 3 for i in range(count)]
+
+
+class GameRecorder:
+    """
+    Records one game as it is played: attach() snapshots the starting
+    position and wraps env.random_empty_cell to log the apple spawns;
+    the game loop appends each action to `actions`.
+    """
+
+    def __init__(self, seed: int, store_spawns: bool = True):
+        self.seed = seed
+        self.store_spawns = store_spawns
+        self.actions: List[int] = []
+        self.spawns: List[Cell] = []
+        self.start: Dict[str, Any] = {}
+        self.config: Optional[EnvConfig] = None
+
+    def attach(self, env: Environment) -> None:
+        self.config = env.config
+        self.start = {
+            "snake": [list(p) for p in env.snake],
+            "green": [list(p) for p in env.green_apples],
+            "red": [list(p) for p in env.red_apples],
+        }
+        if not self.store_spawns:
+            return
+        spawn = env.random_empty_cell
+        spawns = self.spawns
+
+        def recorded_spawn():
+            cell = spawn()
+            spawns.append(cell)
+            return cell
+
+        env.random_empty_cell = recorded_spawn
+
+    def save(self, path: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Write the recording atomically."""
+        config = self.config
+        header = dict(metadata or {})
+        header.update(self.start)
+        header.update({
+            "seed": self.seed,
+            "board": [config.width, config.height],
+            "green_apples": config.green_apples,
+            "red_apples": config.red_apples,
+            "max_steps_without_food": config.max_steps_without_food,
+            "actions_count": len(self.actions),
+            "spawns_count": len(self.spawns) if self.store_spawns else -1,
+        })
+        raw = json.dumps(header, sort_keys=True).encode("utf-8")
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        w = config.width
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_PREFIX.pack(MAGIC, RECORDING_VERSION, 0, len(raw)))
+            f.write(raw)
+            f.write(pack_actions(self.actions))
+            if self.store_spawns:
+                f.write(struct.pack(f"<{len(self.spawns)}H",
+                                    *(y * w + x for x, y in self.spawns)))
+        os.replace(tmp, path)
+
+
+class Recording:
+    """A loaded recording; env_at(step) rebuilds the board after `step` moves."""
+
+    def __init__(self, header: Dict[str, Any], actions: List[int],
+                 spawns: Optional[List[Cell]]):
+        self.header = header
+        self.actions = actions
+        self.spawns = spawns
+        width, height = header["board"]
+        self.config = EnvConfig(
+            width=width,
+            height=height,
+            green_apples=header["green_apples"],
+            red_apples=header["red_apples"],
+            max_steps_without_food=header["max_steps_without_food"],
+        )
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def initial_env(self) -> Environment:
+        """Starting position, with the recorded spawns replacing the RNG."""
+        if self.spawns is None:
+            env_rng, _ = make_rngs(self.header["seed"])
+            return Environment(self.config, rng=env_rng)
+
+        env = Environment(self.config, rng=random.Random(0))
+        env.snake = deque(tuple(p) for p in self.header["snake"])
+        env.green_apples = [tuple(p) for p in self.header["green"]]
+        env.red_apples = [tuple(p) for p in self.header["red"]]
+        env.update_grid()
+        env.random_empty_cell = iter(self.spawns).__next__
+        return env
+
+    def env_at(self, step: int) -> Environment:
+        """Board after the first `step` actions."""
+        env = self.initial_env()
+        for action in self.actions[:step]:
+            if env.game_over:
+                break
+            env.move(ACTION_DIRECTIONS[action])
+        return env
+
+
+def load_recording(path: str) -> Recording:
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, _, header_len = _PREFIX.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Format d'enregistrement inconnu: {path}")
+    if version > RECORDING_VERSION:
+        raise ValueError(f"Version d'enregistrement non supportee ({version}): {path}")
+
+    offset = _PREFIX.size + header_len
+    header = json.loads(data[_PREFIX.size:offset].decode("utf-8"))
+    count = header["actions_count"]
+    packed_len = (count + 3) // 4
+    actions = unpack_actions(data[offset:offset + packed_len], count)
+    offset += packed_len
+
+    spawns = None
+    if header["spawns_count"] >= 0:
+        w = header["board"][0]
+        cells = struct.unpack_from(f"<{header['spawns_count']}H", data, offset)
+        spawns = [(c % w, c // w) for c in cells]
+    return Recording(header, actions, spawns)
@@ -0,0 +1,61 @@
+"""Running statistics and confidence intervals for evaluation results."""
+
+import math
+from statistics import NormalDist
+from typing import Tuple
+
+
+class RunningStats:
+    """Mean and variance in one pass (Welford), plus min and max."""
+
+    __slots__ = ("n", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1)."""
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def half_width(self, z: float) -> float:
+        """Half-width of the normal confidence interval of the mean."""
+        if self.n < 2:
+            return math.inf
+        return z * math.sqrt(self.variance / self.n)
+
+
+def z_value(confidence: float) -> float:
+    """Two-sided normal quantile, e.g. 1.96 for 0.95."""
+    if not 0.0 < confidence < 1.0:
+        raise ValueError(f"Niveau de confiance hors de ]0, 1[: {confidence}")
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def wilson_interval(successes: int, n: int, z: float) -> Tuple[float, float]:
+    """Wilson score interval of a proportion: stays in [0, 1], good at 0% and 100%."""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    z2 = z * z
+    center = (p + z2 / (2 * n)) / (1 + z2 / n)
+    margin = z * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+    return max(0.0, center - margin), min(1.0, center + margin)